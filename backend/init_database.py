@@ -8,6 +8,8 @@ import os
 import sqlite3
 from pathlib import Path
 
+from open_webui.internal.sqlite_pragmas import SQLITE_WAL_PRAGMAS
+
 def init_database():
     """Initialize the database with proper permissions and basic structure"""
     
@@ -28,6 +30,12 @@ def init_database():
     try:
         conn = sqlite3.connect(str(db_path))
         cursor = conn.cursor()
+
+        # Switch to WAL so later processes start with the faster journal
+        for pragma in SQLITE_WAL_PRAGMAS:
+            cursor.execute(pragma)
+        conn.commit()
+        print("✓ SQLite WAL journal mode and synchronous=NORMAL applied")
         
         # Test basic operations
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -39,9 +47,11 @@ def init_database():
         else:
             print("✓ Database connected, but no tables found (this might be normal for first run)")
         
-        # Set proper permissions
+        # Set proper permissions (including any WAL/SHM side files)
         conn.close()
-        os.chmod(str(db_path), 0o666)
+        for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+            if path.exists():
+                os.chmod(str(path), 0o666)
         print(f"✓ Database permissions set to 666")
         
         return True
@@ -57,6 +67,7 @@ def set_environment():
     env_vars = {
         'DATA_DIR': str(backend_dir / "data"),
         'DATABASE_URL': f"sqlite:///{backend_dir}/data/webui.db",
+        'DATABASE_ENABLE_SQLITE_WAL': 'True',
         'WEBUI_SECRET_KEY': 'fixxit-development-secret-key'
     }
     
@@ -4,6 +4,7 @@ import logging
 from contextlib import contextmanager
 from typing import Any, Optional
 
+from open_webui.internal.sqlite_pragmas import SQLITE_WAL_PRAGMAS
 from open_webui.internal.wrappers import register_connection
 from open_webui.env import (
     OPEN_WEBUI_DIR,
@@ -112,14 +113,37 @@ if SQLALCHEMY_DATABASE_URL.startswith("sqlite+sqlcipher://"):
     log.info("Connected to encrypted SQLite database using SQLCipher")
 
 elif "sqlite" in SQLALCHEMY_DATABASE_URL:
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-    )
+    # Keep SQLite connections open between requests so the file open and the
+    # connect-time PRAGMAs below are paid once per pooled connection; sized by
+    # the same DATABASE_POOL_* settings as other databases
+    if isinstance(DATABASE_POOL_SIZE, int) and DATABASE_POOL_SIZE > 0:
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            pool_size=DATABASE_POOL_SIZE,
+            max_overflow=DATABASE_POOL_MAX_OVERFLOW,
+            pool_timeout=DATABASE_POOL_TIMEOUT,
+            pool_recycle=DATABASE_POOL_RECYCLE,
+            poolclass=QueuePool,
+        )
+    elif isinstance(DATABASE_POOL_SIZE, int):
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=NullPool,
+        )
+    else:
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+        )
 
     def on_connect(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
         if DATABASE_ENABLE_SQLITE_WAL:
-            cursor.execute("PRAGMA journal_mode=WAL")
+            for pragma in SQLITE_WAL_PRAGMAS:
+                cursor.execute(pragma)
         else:
             cursor.execute("PRAGMA journal_mode=DELETE")
         cursor.close()
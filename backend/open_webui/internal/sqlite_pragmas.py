@@ -0,0 +1,11 @@
+# PRAGMAs for SQLite in WAL mode, shared by the engine's connect hook and
+# backend/init_database.py. journal_mode is persisted in the database file;
+# the others are per-connection, safe with WAL and re-applied on every connect.
+SQLITE_WAL_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
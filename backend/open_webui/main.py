@@ -1356,6 +1356,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paged invitation listings return the next page's cursor in a header
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -36,11 +36,8 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('token')
     )
-    op.create_index('idx_invitation_token', 'invitation', ['token'])
-    op.create_index('idx_invitation_group_id', 'invitation', ['group_id'])
+    # Secondary indexes are created in 7c3e1f4a9b2d, after any backfill
 
 
 def downgrade() -> None:
-    op.drop_index('idx_invitation_group_id', table_name='invitation')
-    op.drop_index('idx_invitation_token', table_name='invitation')
     op.drop_table('invitation')
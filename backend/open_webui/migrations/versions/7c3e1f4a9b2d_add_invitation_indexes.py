@@ -0,0 +1,41 @@
+"""add invitation indexes
+
+Revision ID: 7c3e1f4a9b2d
+Revises: 13ifl2rdkxo1
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e1f4a9b2d"
+down_revision: Union[str, None] = "13ifl2rdkxo1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("idx_invitation_token", ["token"]),
+    ("idx_invitation_group_id", ["group_id"]),
+]
+
+
+def upgrade() -> None:
+    # Built separately from the table so bulk backfills don't pay per-row
+    # index maintenance. Older installs already have them from 13ifl2rdkxo1.
+    inspector = sa.inspect(op.get_bind())
+    existing = {index["name"] for index in inspector.get_indexes("invitation")}
+
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, "invitation", columns)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="invitation")
@@ -0,0 +1,33 @@
+"""add invitation group status index
+
+Revision ID: b5d2e8f1c604
+Revises: 7c3e1f4a9b2d
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d2e8f1c604"
+down_revision: Union[str, None] = "7c3e1f4a9b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composite index also serves group_id-only lookups, so the
+    # single-column index becomes redundant
+    op.create_index(
+        "idx_invitation_group_status", "invitation", ["group_id", "status"]
+    )
+    op.drop_index("idx_invitation_group_id", table_name="invitation")
+
+
+def downgrade() -> None:
+    op.create_index("idx_invitation_group_id", "invitation", ["group_id"])
+    op.drop_index("idx_invitation_group_status", table_name="invitation")
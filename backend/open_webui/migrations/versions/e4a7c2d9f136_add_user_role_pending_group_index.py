@@ -0,0 +1,31 @@
+"""add user role pending group index
+
+Revision ID: e4a7c2d9f136
+Revises: b5d2e8f1c604
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7c2d9f136"
+down_revision: Union[str, None] = "b5d2e8f1c604"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves pending-user listings: role alone for admins, role plus
+    # pending_group_id for managers
+    op.create_index(
+        "idx_user_role_pending_group", "user", ["role", "pending_group_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_user_role_pending_group", table_name="user")
@@ -1,7 +1,7 @@
 import json
 import logging
 import time
-from typing import Optional
+from typing import Literal, Optional
 import uuid
 
 from open_webui.internal.db import Base, get_db
@@ -22,12 +22,28 @@ from sqlalchemy import (
     ForeignKey,
     cast,
     or_,
+    select,
+    exists,
 )
 
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
+# Bumped on every group or membership write. Per-process caches of results
+# derived from group access compare it to notice changes made by any caller.
+_group_access_version = 0
+
+
+def get_group_access_version() -> int:
+    return _group_access_version
+
+
+def bump_group_access_version():
+    global _group_access_version
+    _group_access_version += 1
+
+
 ####################
 # UserGroup DB Schema
 ####################
@@ -141,6 +157,7 @@ class GroupTable:
                 result = Group(**group.model_dump())
                 db.add(result)
                 db.commit()
+                bump_group_access_version()
                 db.refresh(result)
                 if result:
                     return GroupModel.model_validate(result)
@@ -155,6 +172,10 @@ class GroupTable:
             groups = db.query(Group).order_by(Group.updated_at.desc()).all()
             return [GroupModel.model_validate(group) for group in groups]
 
+    def get_group_ids(self) -> list[str]:
+        with get_db() as db:
+            return [row.id for row in db.query(Group.id).all()]
+
     def get_groups(self, filter) -> list[GroupResponse]:
         with get_db() as db:
             query = db.query(Group)
@@ -184,11 +205,12 @@ class GroupTable:
                             and_(Group.data.isnot(None), json_share == False)
                         )
             groups = query.order_by(Group.updated_at.desc()).all()
+            member_counts = self.get_member_counts([group.id for group in groups])
             return [
                 GroupResponse.model_validate(
                     {
                         **GroupModel.model_validate(group).model_dump(),
-                        "member_count": self.get_group_member_count_by_id(group.id),
+                        "member_count": member_counts.get(group.id, 0),
                     }
                 )
                 for group in groups
@@ -219,12 +241,13 @@ class GroupTable:
             total = query.count()
             query = query.order_by(Group.updated_at.desc())
             groups = query.offset(skip).limit(limit).all()
+            member_counts = self.get_member_counts([group.id for group in groups])
 
             return {
                 "items": [
                     GroupResponse.model_validate(
                         **GroupModel.model_validate(group).model_dump(),
-                        member_count=self.get_group_member_count_by_id(group.id),
+                        member_count=member_counts.get(group.id, 0),
                     )
                     for group in groups
                 ],
@@ -242,6 +265,29 @@ class GroupTable:
                 .all()
             ]
 
+    def get_groups_with_enabled_database(
+        self,
+        member_id: Optional[str] = None,
+        group_ids: Optional[list[str]] = None,
+    ) -> list[GroupModel]:
+        """Groups whose data.database.enabled is true, filtered in SQL"""
+        with get_db() as db:
+            query = db.query(Group).filter(
+                Group.data["database"]["enabled"].as_boolean() == True
+            )
+
+            if member_id is not None:
+                query = query.join(
+                    GroupMember, GroupMember.group_id == Group.id
+                ).filter(GroupMember.user_id == member_id)
+            if group_ids is not None:
+                query = query.filter(Group.id.in_(group_ids))
+
+            return [
+                GroupModel.model_validate(group)
+                for group in query.order_by(Group.updated_at.desc()).all()
+            ]
+
     def get_group_by_id(self, id: str) -> Optional[GroupModel]:
         try:
             with get_db() as db:
@@ -250,6 +296,22 @@ class GroupTable:
         except Exception:
             return None
 
+    def get_groups_by_ids(self, ids: list[str]) -> dict[str, GroupModel]:
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            groups = db.query(Group).filter(Group.id.in_(ids)).all()
+            return {group.id: GroupModel.model_validate(group) for group in groups}
+
+    def get_group_names_by_ids(self, ids: list[str]) -> dict[str, str]:
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            rows = db.query(Group.id, Group.name).filter(Group.id.in_(ids)).all()
+            return {group_id: name for group_id, name in rows}
+
     def get_group_user_ids_by_id(self, id: str) -> Optional[list[str]]:
         with get_db() as db:
             members = (
@@ -298,6 +360,7 @@ class GroupTable:
 
             db.add_all(new_members)
             db.commit()
+            bump_group_access_version()
 
     def get_group_member_count_by_id(self, id: str) -> int:
         with get_db() as db:
@@ -308,6 +371,19 @@ class GroupTable:
             )
             return count if count else 0
 
+    def get_member_counts(self, group_ids: list[str]) -> dict[str, int]:
+        if not group_ids:
+            return {}
+
+        with get_db() as db:
+            counts = (
+                db.query(GroupMember.group_id, func.count(GroupMember.user_id))
+                .filter(GroupMember.group_id.in_(group_ids))
+                .group_by(GroupMember.group_id)
+                .all()
+            )
+            return {group_id: count for group_id, count in counts}
+
     def update_group_by_id(
         self, id: str, form_data: GroupUpdateForm, overwrite: bool = False
     ) -> Optional[GroupModel]:
@@ -320,16 +396,35 @@ class GroupTable:
                     }
                 )
                 db.commit()
+                bump_group_access_version()
                 return self.get_group_by_id(id=id)
         except Exception as e:
             log.exception(e)
             return None
 
+    def patch_group_data(self, id: str, key: str, value) -> Optional[GroupModel]:
+        """Set a single top-level key in the group's data JSON, keeping the rest"""
+        try:
+            with get_db() as db:
+                group = db.query(Group).filter_by(id=id).first()
+                if not group:
+                    return None
+
+                group.data = {**(group.data or {}), key: value}
+                group.updated_at = int(time.time())
+                db.commit()
+                bump_group_access_version()
+                return GroupModel.model_validate(group)
+        except Exception as e:
+            log.exception(e)
+            return None
+
     def delete_group_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                bump_group_access_version()
                 return True
         except Exception:
             return False
@@ -339,6 +434,7 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                bump_group_access_version()
 
                 return True
             except Exception:
@@ -366,6 +462,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                bump_group_access_version()
                 return True
 
             except Exception:
@@ -397,6 +494,7 @@ class GroupTable:
                         result = Group(**new_group.model_dump())
                         db.add(result)
                         db.commit()
+                        bump_group_access_version()
                         db.refresh(result)
                         new_groups.append(GroupModel.model_validate(result))
                     except Exception as e:
@@ -457,6 +555,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                bump_group_access_version()
                 return True
 
             except Exception as e:
@@ -475,25 +574,42 @@ class GroupTable:
 
                 now = int(time.time())
 
-                for user_id in user_ids or []:
-                    try:
-                        db.add(
-                            GroupMember(
-                                id=str(uuid.uuid4()),
-                                group_id=id,
-                                user_id=user_id,
-                                created_at=now,
-                                updated_at=now,
-                            )
+                if user_ids:
+                    from open_webui.models.users import User
+
+                    # Only existing users that aren't members yet; unknown ids and
+                    # duplicates are dropped by the database in one query
+                    new_user_ids = (
+                        db.query(User.id)
+                        .filter(
+                            User.id.in_(user_ids),
+                            User.id.not_in(
+                                select(GroupMember.user_id).where(
+                                    GroupMember.group_id == id
+                                )
+                            ),
+                        )
+                        .all()
+                    )
+
+                    if new_user_ids:
+                        db.execute(
+                            GroupMember.__table__.insert(),
+                            [
+                                {
+                                    "id": str(uuid.uuid4()),
+                                    "group_id": id,
+                                    "user_id": user_id,
+                                    "created_at": now,
+                                    "updated_at": now,
+                                }
+                                for (user_id,) in new_user_ids
+                            ],
                         )
-                        db.flush()  # Detect unique constraint violation early
-                    except Exception:
-                        db.rollback()  # Clear failed INSERT
-                        db.begin()  # Start a new transaction
-                        continue  # Duplicate → ignore
 
                 group.updated_at = now
                 db.commit()
+                bump_group_access_version()
                 db.refresh(group)
 
                 return GroupModel.model_validate(group)
@@ -524,6 +640,7 @@ class GroupTable:
                 group.updated_at = int(time.time())
 
                 db.commit()
+                bump_group_access_version()
                 db.refresh(group)
                 return GroupModel.model_validate(group)
 
@@ -556,11 +673,54 @@ class GroupMemberTable:
                 )
                 db.add(member)
                 db.commit()
+                bump_group_access_version()
                 return True
             except Exception as e:
                 log.exception(e)
                 return False
 
+    def add_user_to_group_if_absent(
+        self, user_id: str, group_id: str
+    ) -> Literal["added", "exists", "no_user"]:
+        """
+        Add a user to a group unless they already belong to it.
+
+        The user and membership checks are a single SELECT, and the insert
+        follows in the same session. group_member has no unique
+        (user_id, group_id) constraint to use ON CONFLICT with.
+        """
+        from open_webui.models.users import User
+
+        with get_db() as db:
+            user_exists, is_member = db.execute(
+                select(
+                    exists().where(User.id == user_id),
+                    exists().where(
+                        GroupMember.user_id == user_id,
+                        GroupMember.group_id == group_id,
+                    ),
+                )
+            ).one()
+
+            if not user_exists:
+                return "no_user"
+            if is_member:
+                return "exists"
+
+            now = int(time.time())
+            db.add(
+                GroupMember(
+                    id=str(uuid.uuid4()),
+                    user_id=user_id,
+                    group_id=group_id,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+            db.commit()
+            bump_group_access_version()
+            return "added"
+
     def remove_user_from_group(self, user_id: str, group_id: str) -> bool:
         """Remove a user from a group"""
         with get_db() as db:
@@ -570,6 +730,7 @@ class GroupMemberTable:
                     GroupMember.group_id == group_id
                 ).delete()
                 db.commit()
+                bump_group_access_version()
                 return True
             except Exception as e:
                 log.exception(e)
@@ -1,11 +1,32 @@
+import logging
 import time
 import uuid
-from typing import Optional
+from typing import Collection, Optional
 
 from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Integer, Boolean, Text, select, and_
-
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    String,
+    Integer,
+    Boolean,
+    Text,
+    Index,
+    select,
+    update,
+    delete,
+    bindparam,
+    literal,
+    and_,
+    or_,
+    case,
+)
+from sqlalchemy.exc import IntegrityError
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 ####################
 # Invitation DB Schema
@@ -18,7 +39,7 @@ class Invitation(Base):
     id = Column(String, primary_key=True, unique=True)
     group_id = Column(String)  # FK to groups table
     created_by = Column(String)  # FK to user who created invitation (manager/admin)
-    token = Column(String, unique=True, index=True)  # Unique token for invitation link
+    token = Column(String, unique=True)  # Unique token for invitation link
 
     # Optional fields for invitation control
     max_uses = Column(Integer, nullable=True)  # null = unlimited
@@ -32,6 +53,14 @@ class Invitation(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        # Mirrors the indexes created by the alembic migrations
+        # WHERE token = ... (uniqueness comes from the column constraint)
+        Index("idx_invitation_token", "token"),
+        # WHERE group_id = ... [AND status = ...]
+        Index("idx_invitation_group_status", "group_id", "status"),
+    )
+
 
 class InvitationModel(BaseModel):
     id: str
@@ -56,6 +85,40 @@ class InvitationModel(BaseModel):
 # DB Helper Methods
 ####################
 
+# Lookup statements are built once; SQLAlchemy's statement cache then reuses
+# their compiled form across calls.
+_select_invitation_by_id = select(Invitation).where(
+    Invitation.id == bindparam("invitation_id")
+)
+_select_invitation_by_token = select(Invitation).where(
+    Invitation.token == bindparam("token")
+)
+_select_invitations_by_group_id = select(Invitation).where(
+    Invitation.group_id == bindparam("group_id")
+)
+_select_invitations_by_group_id_and_status = select(Invitation).where(
+    Invitation.group_id == bindparam("group_id"),
+    Invitation.status == bindparam("status"),
+)
+_select_invitations_by_creator = select(Invitation).where(
+    Invitation.created_by == bindparam("created_by")
+)
+
+# 0 is treated like NULL for both limits: unlimited uses / never expires
+_has_uses_left = or_(
+    Invitation.max_uses.is_(None),
+    Invitation.max_uses == 0,
+    Invitation.current_uses < Invitation.max_uses,
+)
+
+
+def _not_expired(now: int):
+    return or_(
+        Invitation.expires_at.is_(None),
+        Invitation.expires_at == 0,
+        Invitation.expires_at >= now,
+    )
+
 
 class InvitationTable:
     def insert_new_invitation(
@@ -67,69 +130,229 @@ class InvitationTable:
         expires_at: Optional[int] = None,
         note: Optional[str] = None,
     ) -> Optional[InvitationModel]:
+        """
+        Insert an invitation without checking the token beforehand.
+
+        The unique constraint on token is the check: a collision raises
+        IntegrityError so the caller can retry with a fresh token. Other
+        errors are logged and return None.
+        """
+        now = int(time.time())
+
         with get_db() as db:
-            invitation = InvitationModel(
-                **{
-                    "id": str(uuid.uuid4()),
-                    "group_id": group_id,
-                    "created_by": created_by,
-                    "token": token,
-                    "max_uses": max_uses,
-                    "current_uses": 0,
-                    "expires_at": expires_at,
-                    "status": "active",
-                    "note": note,
-                    "created_at": int(time.time()),
-                    "updated_at": int(time.time()),
-                }
+            result = Invitation(
+                id=uuid.uuid4().hex,
+                group_id=group_id,
+                created_by=created_by,
+                token=token,
+                max_uses=max_uses,
+                current_uses=0,
+                expires_at=expires_at,
+                status="active",
+                note=note,
+                created_at=now,
+                updated_at=now,
             )
 
             try:
-                result = Invitation(**invitation.model_dump())
                 db.add(result)
                 db.commit()
-                db.refresh(result)
-                return InvitationModel.model_validate(result)
+                # Every column was set above, so no refresh/validation is needed
+                return InvitationModel.model_construct(
+                    **{
+                        column.name: getattr(result, column.name)
+                        for column in Invitation.__table__.columns
+                    }
+                )
+            except IntegrityError:
+                db.rollback()
+                raise
             except Exception as e:
                 db.rollback()
+                log.exception(f"Error inserting a new invitation: {e}")
+                return None
+
+    def insert_many_invitations(self, rows: list[dict]) -> Optional[list[InvitationModel]]:
+        """
+        Insert several invitations in a single session and commit.
+
+        Each row must already carry id, group_id, created_by, token and the
+        created_at/updated_at timestamps; optional columns fall back to the
+        same defaults as insert_new_invitation. Returns None if the insert
+        failed, in which case no row was written.
+        """
+        if not rows:
+            return []
+
+        rows = [
+            {
+                "max_uses": None,
+                "current_uses": 0,
+                "expires_at": None,
+                "status": "active",
+                "note": None,
+                **row,
+            }
+            for row in rows
+        ]
+
+        with get_db() as db:
+            try:
+                db.execute(Invitation.__table__.insert(), rows)
+                db.commit()
+                return [InvitationModel.model_construct(**row) for row in rows]
+            except Exception as e:
+                db.rollback()
+                log.exception(f"Error inserting new invitations: {e}")
                 return None
 
     def get_invitation_by_id(self, invitation_id: str) -> Optional[InvitationModel]:
         with get_db() as db:
-            invitation = db.query(Invitation).filter_by(id=invitation_id).first()
+            invitation = db.execute(
+                _select_invitation_by_id, {"invitation_id": invitation_id}
+            ).scalar_one_or_none()
             return InvitationModel.model_validate(invitation) if invitation else None
 
     def get_invitation_by_token(self, token: str) -> Optional[InvitationModel]:
         with get_db() as db:
-            invitation = db.query(Invitation).filter_by(token=token).first()
+            invitation = db.execute(
+                _select_invitation_by_token, {"token": token}
+            ).scalar_one_or_none()
             return InvitationModel.model_validate(invitation) if invitation else None
 
-    def get_invitations_by_group_id(self, group_id: str) -> list[InvitationModel]:
+    def get_invitations_by_group_id(
+        self, group_id: str, status: Optional[str] = None
+    ) -> list[InvitationModel]:
         with get_db() as db:
-            invitations = db.query(Invitation).filter_by(group_id=group_id).all()
+            if status is None:
+                invitations = db.execute(
+                    _select_invitations_by_group_id, {"group_id": group_id}
+                ).scalars()
+            else:
+                invitations = db.execute(
+                    _select_invitations_by_group_id_and_status,
+                    {"group_id": group_id, "status": status},
+                ).scalars()
+            return [InvitationModel.model_validate(inv) for inv in invitations]
+
+    def get_invitations_by_ids(self, invitation_ids: list[str]) -> list[InvitationModel]:
+        if not invitation_ids:
+            return []
+
+        with get_db() as db:
+            invitations = db.execute(
+                select(Invitation).where(Invitation.id.in_(invitation_ids))
+            ).scalars()
+            return [InvitationModel.model_validate(inv) for inv in invitations]
+
+    def get_invitations_by_group_ids(
+        self,
+        group_ids: list[str],
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple[int, str]] = None,
+    ) -> list[InvitationModel]:
+        """
+        Invitations for several groups, newest first.
+
+        With limit, returns one page; pass the (created_at, id) of the last
+        row of the previous page as after to continue from there.
+        """
+        if not group_ids:
+            return []
+
+        query = select(Invitation).where(Invitation.group_id.in_(group_ids))
+        return self._get_invitation_page(query, status, limit, after)
+
+    def get_all_invitations(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple[int, str]] = None,
+    ) -> list[InvitationModel]:
+        """
+        Every invitation, newest first, paged like get_invitations_by_group_ids.
+
+        Includes invitations whose group has been deleted.
+        """
+        return self._get_invitation_page(select(Invitation), status, limit, after)
+
+    def _get_invitation_page(
+        self,
+        query,
+        status: Optional[str],
+        limit: Optional[int],
+        after: Optional[tuple[int, str]],
+    ) -> list[InvitationModel]:
+        if status is not None:
+            query = query.where(Invitation.status == status)
+        if after is not None:
+            created_at, invitation_id = after
+            query = query.where(
+                or_(
+                    Invitation.created_at < created_at,
+                    and_(
+                        Invitation.created_at == created_at,
+                        Invitation.id < invitation_id,
+                    ),
+                )
+            )
+        query = query.order_by(Invitation.created_at.desc(), Invitation.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+
+        with get_db() as db:
+            invitations = db.execute(query).scalars()
             return [InvitationModel.model_validate(inv) for inv in invitations]
 
     def get_invitations_by_creator(self, created_by: str) -> list[InvitationModel]:
         with get_db() as db:
-            invitations = db.query(Invitation).filter_by(created_by=created_by).all()
+            invitations = db.execute(
+                _select_invitations_by_creator, {"created_by": created_by}
+            ).scalars()
             return [InvitationModel.model_validate(inv) for inv in invitations]
 
     def increment_invitation_uses(self, invitation_id: str) -> Optional[InvitationModel]:
+        """
+        Atomically consume one use of an invitation.
+
+        The guard in the WHERE clause keeps concurrent redemptions from pushing
+        current_uses past max_uses; returns None if no use was available.
+        """
         with get_db() as db:
             try:
-                invitation = db.query(Invitation).filter_by(id=invitation_id).first()
-                if invitation:
-                    invitation.current_uses += 1
-                    invitation.updated_at = int(time.time())
+                result = db.execute(
+                    update(Invitation)
+                    .where(
+                        Invitation.id == invitation_id,
+                        _has_uses_left,
+                    )
+                    .values(
+                        current_uses=Invitation.current_uses + 1,
+                        updated_at=int(time.time()),
+                        # Mark as expired once max uses is reached
+                        status=case(
+                            (
+                                and_(
+                                    Invitation.max_uses.isnot(None),
+                                    Invitation.max_uses != 0,
+                                    Invitation.current_uses + 1 >= Invitation.max_uses,
+                                ),
+                                "expired",
+                            ),
+                            else_=Invitation.status,
+                        ),
+                    )
+                )
+                db.commit()
 
-                    # Check if max uses reached
-                    if invitation.max_uses and invitation.current_uses >= invitation.max_uses:
-                        invitation.status = "expired"
+                if result.rowcount != 1:
+                    return None
 
-                    db.commit()
-                    db.refresh(invitation)
-                    return InvitationModel.model_validate(invitation)
-                return None
+                invitation = db.execute(
+                    _select_invitation_by_id, {"invitation_id": invitation_id}
+                ).scalar_one_or_none()
+                return InvitationModel.model_validate(invitation) if invitation else None
             except Exception as e:
                 db.rollback()
                 return None
@@ -164,25 +387,124 @@ class InvitationTable:
                 db.rollback()
                 return False
 
-    def is_invitation_valid(self, token: str) -> bool:
-        """Check if invitation is valid (active, not expired, not maxed out)"""
-        invitation = self.get_invitation_by_token(token)
-        if not invitation:
-            return False
+    def revoke_invitation_if_managed(
+        self, invitation_id: str, managed_group_ids: Optional[Collection[str]]
+    ) -> Optional[InvitationModel]:
+        """
+        Disable an invitation only if it belongs to one of managed_group_ids.
+
+        The permission check is part of the UPDATE itself. managed_group_ids
+        of None skips the group check (admins). Returns None when nothing
+        matched, the caller decides between 404 and 403.
+        """
+        query = update(Invitation).where(Invitation.id == invitation_id)
+        if managed_group_ids is not None:
+            query = query.where(Invitation.group_id.in_(managed_group_ids))
+        query = query.values(status="disabled", updated_at=int(time.time())).returning(
+            Invitation
+        )
+
+        with get_db() as db:
+            try:
+                invitation = db.execute(query).scalar_one_or_none()
+                result = InvitationModel.model_validate(invitation) if invitation else None
+                db.commit()
+                return result
+            except Exception as e:
+                db.rollback()
+                return None
+
+    def delete_invitation_if_managed(
+        self, invitation_id: str, managed_group_ids: Optional[Collection[str]]
+    ) -> Optional[InvitationModel]:
+        """Delete counterpart of revoke_invitation_if_managed, returns the removed row"""
+        query = delete(Invitation).where(Invitation.id == invitation_id)
+        if managed_group_ids is not None:
+            query = query.where(Invitation.group_id.in_(managed_group_ids))
+        query = query.returning(Invitation)
+
+        with get_db() as db:
+            try:
+                invitation = db.execute(query).scalar_one_or_none()
+                result = InvitationModel.model_validate(invitation) if invitation else None
+                db.commit()
+                return result
+            except Exception as e:
+                db.rollback()
+                return None
+
+    def update_invitations_status(self, invitation_ids: list[str], status: str) -> int:
+        """Set the status of several invitations in one UPDATE, returns rows changed"""
+        if not invitation_ids:
+            return 0
 
-        # Check status
-        if invitation.status != "active":
-            return False
+        with get_db() as db:
+            try:
+                result = db.execute(
+                    update(Invitation)
+                    .where(Invitation.id.in_(invitation_ids))
+                    .values(status=status, updated_at=int(time.time()))
+                )
+                db.commit()
+                return result.rowcount
+            except Exception as e:
+                db.rollback()
+                return 0
+
+    def delete_invitations_by_ids(self, invitation_ids: list[str]) -> int:
+        """Delete several invitations in one DELETE, returns rows removed"""
+        if not invitation_ids:
+            return 0
+
+        with get_db() as db:
+            try:
+                result = db.execute(
+                    delete(Invitation).where(Invitation.id.in_(invitation_ids))
+                )
+                db.commit()
+                return result.rowcount
+            except Exception as e:
+                db.rollback()
+                return 0
+
+    def get_invitation_with_validity(
+        self, token: str
+    ) -> tuple[Optional[InvitationModel], bool]:
+        """Fetch an invitation by token together with is_invitation_valid's verdict"""
+        now = int(time.time())
+        is_valid = and_(
+            Invitation.status == "active",
+            _not_expired(now),
+            _has_uses_left,
+        )
+
+        with get_db() as db:
+            row = db.execute(
+                select(Invitation, case((is_valid, True), else_=False)).where(
+                    Invitation.token == token
+                )
+            ).first()
 
-        # Check expiration
-        if invitation.expires_at and invitation.expires_at < int(time.time()):
-            return False
+            if not row:
+                return None, False
 
-        # Check max uses
-        if invitation.max_uses and invitation.current_uses >= invitation.max_uses:
-            return False
+            invitation, valid = row
+            return InvitationModel.model_validate(invitation), bool(valid)
 
-        return True
+    def is_invitation_valid(self, token: str) -> bool:
+        """Check if invitation is valid (active, not expired, not maxed out)"""
+        with get_db() as db:
+            return (
+                db.execute(
+                    select(literal(1)).where(
+                        Invitation.token == token,
+                        Invitation.status == "active",
+                        _not_expired(int(time.time())),
+                        _has_uses_left,
+                    )
+                ).scalar()
+                is not None
+            )
 
 
 Invitations = InvitationTable()
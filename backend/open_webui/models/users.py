@@ -1,4 +1,5 @@
 import time
+import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
@@ -6,7 +7,7 @@ from open_webui.internal.db import Base, JSONField, get_db
 
 from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
 from open_webui.models.chats import Chats
-from open_webui.models.groups import Groups, GroupMember
+from open_webui.models.groups import Groups, GroupMember, bump_group_access_version
 from open_webui.models.channels import ChannelMember
 
 
@@ -116,6 +117,11 @@ class UserModel(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @property
+    def managed_groups_set(self) -> frozenset[str]:
+        """managed_groups as a frozenset for constant-time membership checks"""
+        return frozenset(self.managed_groups or ())
+
 
 class UserStatusModel(UserModel):
     is_active: bool = False
@@ -471,6 +477,24 @@ class UsersTable:
             )
             return [UserModel.model_validate(user) for user in users]
 
+    def get_pending_users(
+        self, group_ids: Optional[list[str]] = None
+    ) -> list[UserModel]:
+        """Pending users, optionally only those waiting on one of group_ids"""
+        with get_db() as db:
+            query = db.query(User).filter(User.role == "pending")
+            if group_ids is not None:
+                query = query.filter(User.pending_group_id.in_(group_ids))
+            return [UserModel.model_validate(user) for user in query.all()]
+
+    def has_pending_users(self, group_ids: Optional[list[str]] = None) -> bool:
+        """Whether any user is pending (for one of group_ids), via EXISTS"""
+        with get_db() as db:
+            condition = User.role == "pending"
+            if group_ids is not None:
+                condition = condition & User.pending_group_id.in_(group_ids)
+            return db.query(exists().where(condition)).scalar()
+
     def get_users_by_user_ids(self, user_ids: list[str]) -> list[UserStatusModel]:
         with get_db() as db:
             users = db.query(User).filter(User.id.in_(user_ids)).all()
@@ -616,6 +640,93 @@ class UsersTable:
             print(e)
             return None
 
+    def update_managed_groups_by_id(
+        self, id: str, add: Optional[str] = None, remove: Optional[str] = None
+    ) -> Optional[UserModel]:
+        """
+        Add and/or remove one group id in the user's managed_groups.
+
+        The row is locked (SELECT ... FOR UPDATE on Postgres) between the
+        read and the write, so concurrent changes are not lost. managed_groups
+        is a portable JSON column, which rules out in-database array ops.
+        """
+        try:
+            with get_db() as db:
+                user = db.query(User).filter_by(id=id).with_for_update().first()
+                if not user:
+                    return None
+
+                managed_groups = list(user.managed_groups or [])
+                if add is not None and add not in managed_groups:
+                    managed_groups.append(add)
+                if remove is not None and remove in managed_groups:
+                    managed_groups.remove(remove)
+
+                if managed_groups != (user.managed_groups or []):
+                    user.managed_groups = managed_groups
+                    db.commit()
+                    db.refresh(user)
+                return UserModel.model_validate(user)
+        except Exception as e:
+            print(e)
+            return None
+
+    def update_non_admin_user_by_id(self, id: str, updated: dict) -> bool:
+        """Update the user unless they are an admin, checked by the UPDATE itself"""
+        try:
+            with get_db() as db:
+                count = (
+                    db.query(User)
+                    .filter(User.id == id, User.role != "admin")
+                    .update(updated)
+                )
+                db.commit()
+                return count > 0
+        except Exception as e:
+            print(e)
+            return False
+
+    def approve_pending_user(self, id: str, group_id: Optional[str] = None) -> bool:
+        """
+        Promote a pending user to "user" and add them to group_id, atomically.
+
+        The role change, clearing pending_group_id and the membership insert
+        share one transaction. Returns False if the user is no longer pending.
+        """
+        try:
+            with get_db() as db:
+                updated = (
+                    db.query(User)
+                    .filter_by(id=id, role="pending")
+                    .update({"role": "user", "pending_group_id": None})
+                )
+                if not updated:
+                    db.rollback()
+                    return False
+
+                if group_id and not db.query(
+                    exists().where(
+                        GroupMember.user_id == id, GroupMember.group_id == group_id
+                    )
+                ).scalar():
+                    now = int(time.time())
+                    db.add(
+                        GroupMember(
+                            id=str(uuid.uuid4()),
+                            user_id=id,
+                            group_id=group_id,
+                            created_at=now,
+                            updated_at=now,
+                        )
+                    )
+
+                db.commit()
+                bump_group_access_version()
+                return True
+        except Exception as e:
+            print(e)
+            return False
+
     def update_user_settings_by_id(self, id: str, updated: dict) -> Optional[UserModel]:
         try:
             with get_db() as db:
@@ -650,20 +650,25 @@ async def signup(request: Request, response: Response, form_data: SignupForm):
         log.info(f"Signup with invitation token: {form_data.invitation_token[:16]}...")
         from open_webui.models.invitations import Invitations
 
-        # Validate the invitation token
-        if not Invitations.is_invitation_valid(form_data.invitation_token):
+        # Validate the invitation token and get invitation details
+        invitation, is_valid = Invitations.get_invitation_with_validity(
+            form_data.invitation_token
+        )
+        if not is_valid:
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST,
                 detail="Invalid, expired, or disabled invitation link"
             )
 
-        # Get invitation details
-        invitation = Invitations.get_invitation_by_token(form_data.invitation_token)
         if invitation:
             invitation_group_id = invitation.group_id
             log.info(f"Invitation validated, group_id: {invitation_group_id}")
             # Increment usage counter
             Invitations.increment_invitation_uses(invitation.id)
+
+            from open_webui.routers.invitations import invalidate_invitation_validation
+
+            invalidate_invitation_validation(form_data.invitation_token)
         else:
             log.warning("Invitation token validated but invitation not found")
 
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import time
 from pathlib import Path
@@ -11,6 +12,7 @@ from open_webui.models.groups import (
     GroupUpdateForm,
     GroupResponse,
     UserIdsForm,
+    get_group_access_version,
 )
 
 from open_webui.config import CACHE_DIR
@@ -19,6 +21,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.postgres_connection import postgres_manager, test_database_connection
+from open_webui.routers.logs import invalidate_group_database_cache
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel
 
@@ -28,6 +31,60 @@ log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 router = APIRouter()
 
+# The logs UI polls the accessible-groups endpoint, so connection test results
+# are reused for a short while. Cache misses go through postgres_manager, which
+# keeps a pool per DSN so a re-test does not pay a fresh connection handshake.
+CONNECTION_TEST_CACHE_TTL = 30
+_connection_test_cache: dict[tuple, tuple[float, bool]] = {}
+
+# Entries kept in each of this router's caches
+GROUP_CACHE_MAX_SIZE = 256
+
+
+def _cache_store(cache: dict, key, entry: tuple):
+    """
+    Store a (timestamp, ...) entry, evicting the oldest past GROUP_CACHE_MAX_SIZE
+
+    Re-stored keys move to the end, so the dict stays ordered by timestamp and
+    expired entries are the first to go.
+    """
+    cache.pop(key, None)
+    cache[key] = entry
+    while len(cache) > GROUP_CACHE_MAX_SIZE:
+        cache.pop(next(iter(cache)))
+
+
+async def _test_group_connection(db_config: dict) -> bool:
+    key = (
+        db_config.get("host"),
+        db_config.get("port"),
+        db_config.get("database"),
+        db_config.get("user"),
+        db_config.get("password"),
+    )
+    now = time.monotonic()
+
+    cached = _connection_test_cache.get(key)
+    if cached and now - cached[0] < CONNECTION_TEST_CACHE_TTL:
+        return cached[1]
+
+    result = await postgres_manager.test_connection(db_config)
+    _cache_store(_connection_test_cache, key, (now, result))
+    return result
+
+
+# Final accessible-groups listing per (user id, role, managed groups). An
+# entry is also dropped as soon as any group or membership write bumps the
+# group access version, whichever router, SCIM or OAuth sync made it
+ACCESSIBLE_GROUPS_CACHE_TTL = 15
+_accessible_groups_cache: dict[tuple, tuple[float, int, list[dict]]] = {}
+
+
+def _invalidate_accessible_groups_cache():
+    _accessible_groups_cache.clear()
+    _connection_test_cache.clear()
+
+
 ############################
 # GetFunctions
 ############################
@@ -162,6 +219,8 @@ async def update_group_by_id(
     try:
         group = Groups.update_group_by_id(id, form_data)
         if group:
+            # The update may replace group.data, including the database config
+            invalidate_group_database_cache(id)
             return GroupResponse(
                 **group.model_dump(),
                 member_count=Groups.get_group_member_count_by_id(group.id),
@@ -189,9 +248,7 @@ async def add_user_to_group(
     id: str, form_data: UserIdsForm, user=Depends(get_admin_user)
 ):
     try:
-        if form_data.user_ids:
-            form_data.user_ids = Users.get_valid_user_ids(form_data.user_ids)
-
+        # Unknown user ids are filtered out inside add_users_to_group
         group = Groups.add_users_to_group(id, form_data.user_ids)
         if group:
             return GroupResponse(
@@ -245,6 +302,8 @@ async def delete_group_by_id(id: str, user=Depends(get_admin_user)):
     try:
         result = Groups.delete_group_by_id(id)
         if result:
+            _invalidate_accessible_groups_cache()
+            invalidate_group_database_cache(id)
             return result
         else:
             raise HTTPException(
@@ -281,14 +340,13 @@ async def configure_group_database(
 ):
     """Configure database connection for a group (admin only)"""
     try:
-        # Get existing group
-        group = Groups.get_group_by_id(id)
-        if not group:
+        # Fail fast on an unknown group, before any outbound connection test
+        if not Groups.get_group_by_id(id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=ERROR_MESSAGES.DEFAULT("Group not found"),
             )
-        
+
         # Parse and validate connection string
         try:
             connection_config = postgres_manager.create_connection_config(
@@ -310,30 +368,24 @@ async def configure_group_database(
                     detail=ERROR_MESSAGES.DEFAULT("Database connection test failed"),
                 )
         
-        # Update group data with database configuration
-        group_data = group.data or {}
-        group_data["database"] = {
+        # Update only the database key of the group data
+        database_config = {
             "enabled": config_form.enabled,
             "connection": connection_config,
             "configured_at": int(time.time()),
             "configured_by": user.id
         }
         
-        log.info(f"Saving database config for group {id}: enabled={config_form.enabled}, group_data={group_data}")
-        
-        # Update group
-        updated_group = Groups.update_group_by_id(
-            id, 
-            GroupUpdateForm(
-                name=group.name,
-                description=group.description,
-                data=group_data
-            )
-        )
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Saving database config for group %s: %s", id, database_config)
         
+        updated_group = Groups.patch_group_data(id, "database", database_config)
         if updated_group:
-            log.info(f"Database configured for group {id} by user {user.id}")
-            log.info(f"Updated group data: {updated_group.data}")
+            _invalidate_accessible_groups_cache()
+            invalidate_group_database_cache(id)
+            log.info("Database configured for group %s by user %s", id, user.id)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Updated group data: %s", updated_group.data)
             return GroupResponse(
                 **updated_group.model_dump(),
                 member_count=Groups.get_group_member_count_by_id(updated_group.id),
@@ -366,14 +418,16 @@ async def get_group_database_config(id: str, user=Depends(get_admin_user)):
             )
         
         if not group.data or "database" not in group.data:
-            log.info(f"Group {id} has no database config in data: {group.data}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Group %s has no database config in data: %s", id, group.data)
             return DatabaseConfigResponse(
                 enabled=False,
                 connection={}
             )
         
         db_config = group.data["database"]
-        log.info(f"Group {id} database config: {db_config}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Group %s database config: %s", id, db_config)
         
         # Return config without sensitive password
         safe_connection = db_config["connection"].copy()
@@ -424,55 +478,70 @@ async def test_database_connection_endpoint(
 @router.get("/accessible-with-logs", response_model=list[dict])
 async def get_accessible_groups_with_logs(user=Depends(get_verified_user)):
     """Get groups accessible to user that have database configuration enabled"""
+    cache_key = (user.id, user.role, tuple(user.managed_groups or ()))
+    access_version = get_group_access_version()
+    cached = _accessible_groups_cache.get(cache_key)
+    if (
+        cached
+        and cached[1] == access_version
+        and time.monotonic() - cached[0] < ACCESSIBLE_GROUPS_CACHE_TTL
+    ):
+        return cached[2]
+
     try:
-        # Get user's groups based on role
+        # Get user's groups with an enabled database, based on role
         if user.role == "admin":
             # Admins see all groups
-            groups = Groups.get_groups(filter={})
+            enabled_groups = Groups.get_groups_with_enabled_database()
         elif user.role == "manager":
             # Managers see their managed groups
             if user.managed_groups:
-                groups = [Groups.get_group_by_id(gid) for gid in user.managed_groups]
-                groups = [g for g in groups if g is not None]
+                enabled_groups = Groups.get_groups_with_enabled_database(
+                    group_ids=user.managed_groups
+                )
             else:
-                groups = []
+                enabled_groups = []
         else:
             # Regular users see groups they are members of
-            groups = Groups.get_groups(filter={"member_id": user.id})
+            enabled_groups = Groups.get_groups_with_enabled_database(member_id=user.id)
         
+        log.debug("Checking %d groups with enabled database for user %s", len(enabled_groups), user.id)
+
+        # Test actual connections concurrently to verify credentials work
+        results = await asyncio.gather(
+            *[
+                _test_group_connection(group.data["database"].get("connection", {}))
+                for group in enabled_groups
+            ],
+            return_exceptions=True,
+        )
+
         accessible_groups = []
-        log.info(f"Checking {len(groups)} groups for user {user.id}")
-        
-        for group in groups:
-            log.info(f"Group {group.id} ({group.name}): data={group.data}")
-            if (group.data and 
-                "database" in group.data and 
-                group.data["database"].get("enabled", False)):
-                
-                # Test actual connection to verify credentials work
-                db_config = group.data["database"].get("connection", {})
-                connection_test_result = await postgres_manager.test_connection(db_config)
-                log.info(f"Group {group.id} database connection test result: {connection_test_result}")
-                
-                if connection_test_result:
-                    log.info(f"Group {group.id} has enabled database with working connection - adding to accessible groups")
-                    accessible_groups.append({
-                        "id": group.id,
-                        "name": group.name,
-                        "description": group.description
-                    })
-                else:
-                    log.error(f"Group {group.id} has enabled database but connection failed")
-                    # Still add to accessible groups so user can see the issue
-                    accessible_groups.append({
-                        "id": group.id,
-                        "name": group.name,
-                        "description": group.description + " (Connection Failed)"
-                    })
+        for group, connection_test_result in zip(enabled_groups, results):
+            connection_test_result = connection_test_result is True
+            log.debug("Group %s database connection test result: %s", group.id, connection_test_result)
+
+            if connection_test_result:
+                accessible_groups.append({
+                    "id": group.id,
+                    "name": group.name,
+                    "description": group.description
+                })
             else:
-                log.info(f"Group {group.id} does not have enabled database")
+                log.error("Group %s has enabled database but connection failed", group.id)
+                # Still add to accessible groups so user can see the issue
+                accessible_groups.append({
+                    "id": group.id,
+                    "name": group.name,
+                    "description": group.description + " (Connection Failed)"
+                })
         
-        log.info(f"Returning {len(accessible_groups)} accessible groups with logs")
+        log.debug("Returning %d accessible groups with logs", len(accessible_groups))
+        _cache_store(
+            _accessible_groups_cache,
+            cache_key,
+            (time.monotonic(), access_version, accessible_groups),
+        )
         return accessible_groups
         
     except Exception as e:
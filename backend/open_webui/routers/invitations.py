@@ -8,26 +8,33 @@ Managers and admins can:
 - View invitation usage statistics
 """
 
+import asyncio
+import base64
 import logging
 import secrets
 import time
 import os
+import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.exc import IntegrityError
 
 from open_webui.models.invitations import Invitations, InvitationModel
 from open_webui.models.groups import Groups
 from open_webui.utils.auth import get_admin_or_manager_user, get_current_user
-from open_webui.utils.managers import can_manage_group, get_managed_groups
+from open_webui.utils.managers import can_manage_group, get_managed_group_ids, is_admin
 from open_webui.constants import ERROR_MESSAGES
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Get frontend URL from environment variable, default to production
 FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "https://app.fixxit.ai")
+INVITE_URL_PATH = "/auth?invite="
+INVITE_URL_PREFIX = FRONTEND_BASE_URL + INVITE_URL_PATH
 
 
 def get_base_url_from_request(request: Request) -> str:
@@ -59,6 +66,22 @@ class CreateInvitationRequest(BaseModel):
     note: Optional[str] = Field(None, description="Optional note about invitation purpose")
 
 
+class CreateBulkInvitationRequest(CreateInvitationRequest):
+    """Request model for creating several invitations at once"""
+    count: int = Field(..., ge=1, le=500, description="Number of invitations to create")
+
+
+class BulkInvitationIdsRequest(BaseModel):
+    """Request model for revoking or deleting several invitations"""
+    ids: list[str] = Field(..., min_length=1, max_length=500, description="Invitation IDs")
+
+
+class BulkInvitationActionResponse(BaseModel):
+    """Result of a bulk revoke/delete"""
+    updated: int
+    skipped: list[str]
+
+
 class InvitationResponse(BaseModel):
     """Response model for invitation with link"""
     id: str
@@ -90,26 +113,121 @@ class InvitationValidationResponse(BaseModel):
 # Helper Functions
 ############################
 
+# Short-lived cache for the public validation endpoint, keyed by token
+VALIDATION_CACHE_TTL = 15
+VALIDATION_CACHE_MAX_SIZE = 10000
+_validation_cache: dict[str, tuple[float, "InvitationValidationResponse"]] = {}
+
+
+def invalidate_invitation_validation(token: str):
+    """Drop a cached validation result after the invitation changed"""
+    _validation_cache.pop(token, None)
+
+
+# Token collisions are only expected from a broken random source; give up
+# after a few regenerated tokens instead of looping
+INSERT_TOKEN_ATTEMPTS = 3
+
+# Invitation listings are paged; clients follow X-Next-Cursor for more
+INVITATION_PAGE_SIZE = 100
+INVITATION_MAX_PAGE_SIZE = 500
+
+
+def parse_invitation_cursor(cursor: Optional[str]) -> Optional[tuple[int, str]]:
+    """Parse a "<created_at>:<id>" pagination cursor"""
+    if not cursor:
+        return None
+
+    try:
+        created_at, invitation_id = cursor.split(":", 1)
+        return int(created_at), invitation_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def invitation_list_response(
+    responses: list[InvitationResponse],
+    invitations: list[InvitationModel],
+    limit: int
+) -> ORJSONResponse:
+    """Serialize a list of invitations straight to JSON
+
+    Sets X-Next-Cursor when a full page was returned so the client can
+    request the next one.
+    """
+    headers = {}
+    if len(invitations) == limit:
+        last = invitations[-1]
+        headers["X-Next-Cursor"] = f"{last.created_at}:{last.id}"
+
+    return ORJSONResponse(
+        content=[r.model_dump(mode="json") for r in responses],
+        headers=headers
+    )
+
+
+async def get_manageable_invitations(
+    ids: list[str], http_request: Request, user
+) -> tuple[list[InvitationModel], list[str]]:
+    """
+    Load invitations by id in one query and split them by permission.
+
+    Returns the invitations the user may manage and the ids that were
+    skipped because they do not exist or belong to another group.
+    """
+    invitations = await asyncio.to_thread(Invitations.get_invitations_by_ids, ids)
+    allowed_groups = {
+        group_id
+        for group_id in {inv.group_id for inv in invitations}
+        if can_manage_group(user, group_id, http_request)
+    }
+
+    allowed = [inv for inv in invitations if inv.group_id in allowed_groups]
+    allowed_ids = {inv.id for inv in allowed}
+    skipped = [invitation_id for invitation_id in ids if invitation_id not in allowed_ids]
+    return allowed, skipped
+
 
 def generate_invitation_token() -> str:
     """Generate a secure random token for invitation"""
     return secrets.token_urlsafe(32)
 
 
+def generate_invitation_tokens(count: int) -> list[str]:
+    """Generate several tokens from a single read of the OS random source
+
+    Each token is 32 random bytes in url-safe base64, same as
+    generate_invitation_token.
+    """
+    raw = os.urandom(32 * count)
+    return [
+        base64.urlsafe_b64encode(raw[i * 32:(i + 1) * 32]).rstrip(b"=").decode()
+        for i in range(count)
+    ]
+
+
 def format_invitation_response(
     invitation: InvitationModel,
-    base_url: str = None
+    groups_by_id: dict,
+    url_prefix: str = INVITE_URL_PREFIX
 ) -> InvitationResponse:
-    """Format invitation with group details and full URL"""
-    if base_url is None:
-        base_url = FRONTEND_BASE_URL
+    """Format invitation with group details and full URL
 
-    group = Groups.get_group_by_id(invitation.group_id)
+    groups_by_id maps group id -> group and is fetched once by the caller,
+    so formatting a list does not query the groups table per invitation.
+    url_prefix is the base URL plus INVITE_URL_PATH; callers formatting a
+    list build it once.
+    """
+    group = groups_by_id.get(invitation.group_id)
     group_name = group.name if group else "Unknown Group"
 
-    invitation_url = f"{base_url}/auth?invite={invitation.token}"
+    invitation_url = url_prefix + invitation.token
 
-    return InvitationResponse(
+    # Fields come from an already validated InvitationModel, skip re-validation
+    return InvitationResponse.model_construct(
         id=invitation.id,
         group_id=invitation.group_id,
         group_name=group_name,
@@ -144,37 +262,42 @@ async def create_invitation(
     Admins can create invitations for any group.
     """
     # Check permissions
-    if not can_manage_group(user, request.group_id):
+    if not can_manage_group(user, request.group_id, http_request):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to create invitations for this group"
         )
 
     # Verify group exists
-    group = Groups.get_group_by_id(request.group_id)
+    group = await asyncio.to_thread(Groups.get_group_by_id, request.group_id)
     if not group:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Group {request.group_id} not found"
         )
 
-    # Generate unique token
-    token = generate_invitation_token()
-
     # Calculate expiration timestamp if specified
     expires_at = None
     if request.expires_in_hours:
         expires_at = int(time.time()) + (request.expires_in_hours * 3600)
 
-    # Create invitation
-    invitation = Invitations.insert_new_invitation(
-        group_id=request.group_id,
-        created_by=user.id,
-        token=token,
-        max_uses=request.max_uses,
-        expires_at=expires_at,
-        note=request.note
-    )
+    # Create invitation; the unique index on token rejects a duplicate, in
+    # which case a fresh token is generated and the insert retried
+    invitation = None
+    for _ in range(INSERT_TOKEN_ATTEMPTS):
+        try:
+            invitation = await asyncio.to_thread(
+                Invitations.insert_new_invitation,
+                group_id=request.group_id,
+                created_by=user.id,
+                token=generate_invitation_token(),
+                max_uses=request.max_uses,
+                expires_at=expires_at,
+                note=request.note
+            )
+            break
+        except IntegrityError:
+            logger.warning("Invitation token collision, retrying with a new token")
 
     if not invitation:
         raise HTTPException(
@@ -182,17 +305,81 @@ async def create_invitation(
             detail="Failed to create invitation"
         )
 
-    logger.info(f"Invitation created by {user.id} for group {request.group_id}")
+    logger.info("Invitation created by %s for group %s", user.id, request.group_id)
 
     # Get base URL from request and pass to formatter
-    base_url = get_base_url_from_request(http_request)
-    return format_invitation_response(invitation, base_url)
+    url_prefix = get_base_url_from_request(http_request) + INVITE_URL_PATH
+    return format_invitation_response(invitation, {group.id: group}, url_prefix)
+
+
+@router.post("/create/bulk", response_model=list[InvitationResponse])
+async def create_bulk_invitations(
+    request: CreateBulkInvitationRequest,
+    http_request: Request,
+    user=Depends(get_admin_or_manager_user)
+):
+    """
+    Create several single-purpose invitation links for a group in one batch.
+
+    Same permission rules as /create. All rows are inserted in one transaction.
+    """
+    # Check permissions
+    if not can_manage_group(user, request.group_id, http_request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to create invitations for this group"
+        )
+
+    # Verify group exists
+    group = await asyncio.to_thread(Groups.get_group_by_id, request.group_id)
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Group {request.group_id} not found"
+        )
+
+    now = int(time.time())
+    expires_at = None
+    if request.expires_in_hours:
+        expires_at = now + (request.expires_in_hours * 3600)
+
+    rows = [
+        {
+            "id": uuid.uuid4().hex,
+            "group_id": request.group_id,
+            "created_by": user.id,
+            "token": token,
+            "max_uses": request.max_uses,
+            "expires_at": expires_at,
+            "note": request.note,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for token in generate_invitation_tokens(request.count)
+    ]
+
+    invitations = await asyncio.to_thread(Invitations.insert_many_invitations, rows)
+
+    if invitations is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create invitations"
+        )
+
+    logger.info("%d invitations created by %s for group %s", len(invitations), user.id, request.group_id)
+
+    url_prefix = get_base_url_from_request(http_request) + INVITE_URL_PATH
+    groups_by_id = {group.id: group}
+    return [format_invitation_response(inv, groups_by_id, url_prefix) for inv in invitations]
 
 
 @router.get("/group/{group_id}", response_model=list[InvitationResponse])
 async def get_group_invitations(
     group_id: str,
     http_request: Request,
+    status_filter: Optional[str] = Query(None, alias="status", description="Only return invitations with this status"),
+    limit: int = Query(INVITATION_PAGE_SIZE, ge=1, le=INVITATION_MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     user=Depends(get_admin_or_manager_user)
 ):
     """
@@ -201,22 +388,37 @@ async def get_group_invitations(
     Managers can only view invitations for groups they manage.
     """
     # Check permissions
-    if not can_manage_group(user, group_id):
+    if not can_manage_group(user, group_id, http_request):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to view invitations for this group"
         )
 
-    invitations = Invitations.get_invitations_by_group_id(group_id)
+    invitations = await asyncio.to_thread(
+        Invitations.get_invitations_by_group_ids,
+        [group_id],
+        status=status_filter,
+        limit=limit,
+        after=parse_invitation_cursor(cursor),
+    )
+    groups_by_id = (
+        await asyncio.to_thread(Groups.get_groups_by_ids, [group_id]) if invitations else {}
+    )
 
     # Get base URL from request and pass to formatter
-    base_url = get_base_url_from_request(http_request)
-    return [format_invitation_response(inv, base_url) for inv in invitations]
+    url_prefix = get_base_url_from_request(http_request) + INVITE_URL_PATH
+    return invitation_list_response(
+        [format_invitation_response(inv, groups_by_id, url_prefix) for inv in invitations],
+        invitations,
+        limit
+    )
 
 
 @router.get("/list", response_model=list[InvitationResponse])
 async def list_my_invitations(
     http_request: Request,
+    limit: int = Query(INVITATION_PAGE_SIZE, ge=1, le=INVITATION_MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     user=Depends(get_admin_or_manager_user)
 ):
     """
@@ -225,39 +427,92 @@ async def list_my_invitations(
     Managers see invitations for all groups they manage.
     Admins see all invitations.
     """
-    managed_groups = get_managed_groups(user)
-
-    if user.role == "admin":
-        # Admin can see all invitations - get invitations for all groups
-        all_invitations = []
-        all_groups = Groups.get_groups({})
-        for group in all_groups:
-            group_invitations = Invitations.get_invitations_by_group_id(group.id)
-            all_invitations.extend(group_invitations)
-        invitations = all_invitations
+    after = parse_invitation_cursor(cursor)
+    if is_admin(user):
+        # No group filter, so invitations of deleted groups are listed too
+        invitations = await asyncio.to_thread(
+            Invitations.get_all_invitations, limit=limit, after=after
+        )
     else:
-        # Manager sees invitations for their managed groups
-        invitations = []
-        for group_id in managed_groups:
-            group_invitations = Invitations.get_invitations_by_group_id(group_id)
-            invitations.extend(group_invitations)
+        managed_groups = await asyncio.to_thread(get_managed_group_ids, http_request, user)
+        invitations = await asyncio.to_thread(
+            Invitations.get_invitations_by_group_ids,
+            list(managed_groups),
+            limit=limit,
+            after=after,
+        )
+
+    groups_by_id = await asyncio.to_thread(Groups.get_groups_by_ids, list({inv.group_id for inv in invitations}))
 
     # Get base URL from request and pass to formatter
-    base_url = get_base_url_from_request(http_request)
-    return [format_invitation_response(inv, base_url) for inv in invitations]
+    url_prefix = get_base_url_from_request(http_request) + INVITE_URL_PATH
+    return invitation_list_response(
+        [format_invitation_response(inv, groups_by_id, url_prefix) for inv in invitations],
+        invitations,
+        limit
+    )
 
 
-@router.post("/{invitation_id}/revoke")
-async def revoke_invitation(
-    invitation_id: str,
+@router.post("/bulk-revoke", response_model=BulkInvitationActionResponse)
+async def bulk_revoke_invitations(
+    request: BulkInvitationIdsRequest,
+    http_request: Request,
     user=Depends(get_admin_or_manager_user)
 ):
     """
-    Revoke (disable) an invitation.
+    Revoke (disable) several invitations at once.
 
-    Managers can only revoke invitations for groups they manage.
+    Invitations that do not exist or belong to groups the user cannot
+    manage are skipped and returned in the response.
+    """
+    invitations, skipped = await get_manageable_invitations(request.ids, http_request, user)
+
+    updated = await asyncio.to_thread(
+        Invitations.update_invitations_status, [inv.id for inv in invitations], "disabled"
+    )
+    for inv in invitations:
+        invalidate_invitation_validation(inv.token)
+
+    logger.info("%d invitations revoked by %s", updated, user.id)
+
+    return BulkInvitationActionResponse(updated=updated, skipped=skipped)
+
+
+@router.delete("/bulk", response_model=BulkInvitationActionResponse)
+async def bulk_delete_invitations(
+    request: BulkInvitationIdsRequest,
+    http_request: Request,
+    user=Depends(get_admin_or_manager_user)
+):
+    """
+    Permanently delete several invitations at once.
+
+    Invitations that do not exist or belong to groups the user cannot
+    manage are skipped and returned in the response.
+    """
+    invitations, skipped = await get_manageable_invitations(request.ids, http_request, user)
+
+    deleted = await asyncio.to_thread(
+        Invitations.delete_invitations_by_ids, [inv.id for inv in invitations]
+    )
+    for inv in invitations:
+        invalidate_invitation_validation(inv.token)
+
+    logger.info("%d invitations deleted by %s", deleted, user.id)
+
+    return BulkInvitationActionResponse(updated=deleted, skipped=skipped)
+
+
+async def raise_for_unmodified_invitation(
+    invitation_id: str, http_request: Request, user, action: str
+):
+    """
+    Explain why a permission-guarded write on an invitation matched no row.
+
+    Only runs on the failure path: 404 if the invitation does not exist,
+    403 if it belongs to a group the user cannot manage, else 500.
     """
-    invitation = Invitations.get_invitation_by_id(invitation_id)
+    invitation = await asyncio.to_thread(Invitations.get_invitation_by_id, invitation_id)
 
     if not invitation:
         raise HTTPException(
@@ -265,23 +520,42 @@ async def revoke_invitation(
             detail="Invitation not found"
         )
 
-    # Check permissions
-    if not can_manage_group(user, invitation.group_id):
+    if not can_manage_group(user, invitation.group_id, http_request):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to revoke this invitation"
+            detail=f"You do not have permission to {action} this invitation"
         )
 
-    # Update status to disabled
-    updated_invitation = Invitations.update_invitation_status(invitation_id, "disabled")
+    raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Failed to {action} invitation"
+    )
 
-    if not updated_invitation:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to revoke invitation"
-        )
 
-    logger.info(f"Invitation {invitation_id} revoked by {user.id}")
+@router.post("/{invitation_id}/revoke")
+async def revoke_invitation(
+    invitation_id: str,
+    http_request: Request,
+    user=Depends(get_admin_or_manager_user)
+):
+    """
+    Revoke (disable) an invitation.
+
+    Managers can only revoke invitations for groups they manage.
+    """
+    # Admins may touch any group; managers are restricted inside the UPDATE
+    managed_group_ids = None if is_admin(user) else get_managed_group_ids(http_request, user)
+
+    invitation = await asyncio.to_thread(
+        Invitations.revoke_invitation_if_managed, invitation_id, managed_group_ids
+    )
+
+    if not invitation:
+        await raise_for_unmodified_invitation(invitation_id, http_request, user, "revoke")
+
+    invalidate_invitation_validation(invitation.token)
+
+    logger.info("Invitation %s revoked by %s", invitation_id, user.id)
 
     return {"success": True, "message": "Invitation revoked successfully"}
 
@@ -289,6 +563,7 @@ async def revoke_invitation(
 @router.delete("/{invitation_id}")
 async def delete_invitation(
     invitation_id: str,
+    http_request: Request,
     user=Depends(get_admin_or_manager_user)
 ):
     """
@@ -296,43 +571,27 @@ async def delete_invitation(
 
     Managers can only delete invitations for groups they manage.
     """
-    invitation = Invitations.get_invitation_by_id(invitation_id)
-
-    if not invitation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Invitation not found"
-        )
+    managed_group_ids = None if is_admin(user) else get_managed_group_ids(http_request, user)
 
-    # Check permissions
-    if not can_manage_group(user, invitation.group_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to delete this invitation"
-        )
+    invitation = await asyncio.to_thread(
+        Invitations.delete_invitation_if_managed, invitation_id, managed_group_ids
+    )
 
-    # Delete invitation
-    success = Invitations.delete_invitation_by_id(invitation_id)
+    if not invitation:
+        await raise_for_unmodified_invitation(invitation_id, http_request, user, "delete")
 
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete invitation"
-        )
+    invalidate_invitation_validation(invitation.token)
 
-    logger.info(f"Invitation {invitation_id} deleted by {user.id}")
+    logger.info("Invitation %s deleted by %s", invitation_id, user.id)
 
     return {"success": True, "message": "Invitation deleted successfully"}
 
 
-@router.get("/validate/{token}", response_model=InvitationValidationResponse)
-async def validate_invitation(token: str):
-    """
-    Validate an invitation token (public endpoint for signup page).
-
-    Returns validation status and group information if valid.
-    """
-    invitation = Invitations.get_invitation_by_token(token)
+async def build_invitation_validation(token: str) -> InvitationValidationResponse:
+    """Look up an invitation token and describe whether it can be used"""
+    invitation, is_valid = await asyncio.to_thread(
+        Invitations.get_invitation_with_validity, token
+    )
 
     if not invitation:
         return InvitationValidationResponse(
@@ -341,7 +600,7 @@ async def validate_invitation(token: str):
         )
 
     # Check if invitation is valid
-    if not Invitations.is_invitation_valid(token):
+    if not is_valid:
         reason = "expired" if invitation.status == "expired" else "disabled"
         if invitation.expires_at and invitation.expires_at < int(time.time()):
             reason = "expired (time)"
@@ -354,7 +613,7 @@ async def validate_invitation(token: str):
         )
 
     # Get group information
-    group = Groups.get_group_by_id(invitation.group_id)
+    group = await asyncio.to_thread(Groups.get_group_by_id, invitation.group_id)
 
     return InvitationValidationResponse(
         valid=True,
@@ -362,3 +621,25 @@ async def validate_invitation(token: str):
         group_name=group.name if group else "Unknown Group",
         message="Invitation is valid"
     )
+
+
+@router.get("/validate/{token}", response_model=InvitationValidationResponse)
+async def validate_invitation(token: str):
+    """
+    Validate an invitation token (public endpoint for signup page).
+
+    Returns validation status and group information if valid.
+    Results, including unknown tokens, are cached briefly per token.
+    """
+    now = time.monotonic()
+    cached = _validation_cache.get(token)
+    if cached and now - cached[0] < VALIDATION_CACHE_TTL:
+        return cached[1]
+
+    response = await build_invitation_validation(token)
+
+    if len(_validation_cache) >= VALIDATION_CACHE_MAX_SIZE:
+        _validation_cache.clear()
+    _validation_cache[token] = (now, response)
+
+    return response
@@ -3,15 +3,21 @@ Logs management router for Supabase integration
 Handles CRUD operations for external logs storage with group-based access control
 """
 
+import asyncio
+import heapq
 import logging
 import time
 import uuid
-import json
 import re
+from functools import lru_cache
+from operator import itemgetter
+from itertools import groupby, islice, repeat
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from open_webui.utils.auth import get_verified_user, get_admin_user
@@ -22,7 +28,8 @@ from open_webui.constants import ERROR_MESSAGES
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# orjson serializes the large log lists considerably faster than the stdlib encoder
+router = APIRouter(default_response_class=ORJSONResponse)
 
 ############################
 # Request/Response Models
@@ -43,6 +50,10 @@ class LogCreationRequest(BaseModel):
     equipment_group: Optional[List[str]] = Field(None, description="Equipment involved")
     notes: Optional[str] = Field(None, description="Additional notes")
 
+class BulkLogCreationRequest(BaseModel):
+    """Request model for creating several logs in one group"""
+    logs: List[LogCreationRequest] = Field(..., min_length=1, max_length=1000, description="Logs to create")
+
 class LogResponse(BaseModel):
     """Response model for log data"""
     id: int
@@ -93,88 +104,327 @@ class EquipmentGroupResponse(BaseModel):
 # Helper Functions
 ############################
 
+# Group database configs are read on every logs request but only change when
+# an admin reconfigures a group; the groups router invalidates on changes
+GROUP_DATABASE_CACHE_TTL = 60
+_group_database_cache: Dict[str, tuple[float, Optional[dict]]] = {}
+
+
+# Filter dropdown data (categories, equipment) is requested on every logs page
+# load but changes rarely. Keyed by the set of group ids (and search term)
+FILTER_OPTIONS_CACHE_TTL = 60
+FILTER_OPTIONS_CACHE_MAX_SIZE = 1000
+_categories_cache: Dict[frozenset, tuple[float, List[str]]] = {}
+_equipment_cache: Dict[tuple, tuple[float, List[dict]]] = {}
+
+
+def invalidate_group_database_cache(group_id: Optional[str] = None):
+    """Forget the cached database config of one group, or of all groups"""
+    if group_id is None:
+        _group_database_cache.clear()
+    else:
+        _group_database_cache.pop(group_id, None)
+
+    # Cached results may have come from the old database
+    _categories_cache.clear()
+    _equipment_cache.clear()
+
+
 async def get_group_database_connection(group_id: str):
     """Get database connection configuration for a group"""
+    now = time.monotonic()
+    cached = _group_database_cache.get(group_id)
+    if cached and now - cached[0] < GROUP_DATABASE_CACHE_TTL:
+        return cached[1]
+
     group = Groups.get_group_by_id(group_id)
-    if not group or not group.data or "database" not in group.data:
+    connection = group_database_config(group) if group else None
+
+    _group_database_cache[group_id] = (now, connection)
+    return connection
+
+
+def group_database_config(group) -> Optional[dict]:
+    """Connection config of a loaded group, None if it has no enabled database"""
+    if not group.data or "database" not in group.data:
         return None
-    
+
     db_config = group.data["database"]
     if not db_config.get("enabled", False):
         return None
-    
+
     return db_config["connection"]
 
-def format_log_entry(log_data: dict, group_name: str, group_id: str) -> LogResponse:
-    """Format database log entry into response model"""
-    
-    def safe_datetime_to_string(dt_value):
-        """Convert datetime object to string safely"""
-        if dt_value is None:
-            return ""
-        if isinstance(dt_value, datetime):
-            return dt_value.isoformat()
-        return str(dt_value)
-    
-    def safe_json_parse(json_str):
-        """Parse JSON string to list/dict safely"""
-        if json_str is None:
-            return None
-        if isinstance(json_str, (list, dict)):
-            return json_str
-        if isinstance(json_str, str):
-            # First try to parse as JSON
-            try:
-                parsed = json.loads(json_str)
-                # Ensure it's a list
-                if isinstance(parsed, list):
-                    return parsed
-                # If it's a single value, wrap it in a list
-                return [parsed] if parsed else None
-            except (json.JSONDecodeError, ValueError):
-                # If JSON parsing fails, check if it looks like a numbered list
-                if re.match(r'^\d+\.', json_str.strip()):
-                    # Split by numbered list pattern (1. 2. 3. etc)
-                    items = re.split(r'\d+\.\s*', json_str)
-                    return [item.strip() for item in items if item.strip()]
-                # Otherwise, treat as comma-separated string
-                return [item.strip() for item in json_str.split(',') if item.strip()]
-        return None
-    
-    return LogResponse(
-        id=log_data.get("id"),
-        session_id=log_data.get("session_id", ""),
-        insight_title=log_data.get("insight_title", ""),
-        insight_content=log_data.get("insight_content", ""),
-        user_name=log_data.get("user_name", ""),
-        created_at=safe_datetime_to_string(log_data.get("created_at")),
-        updated_at=safe_datetime_to_string(log_data.get("updated_at")),
-        source=log_data.get("source", ""),
-        log_type=log_data.get("log_type", ""),
-        activation_status=log_data.get("activation_status", ""),
-        verified=log_data.get("verified", False),
-        verification_method=log_data.get("verification_method"),
-        verified_at=safe_datetime_to_string(log_data.get("verified_at")),
-        verified_by=log_data.get("verified_by"),
-        ai_generated_at=safe_datetime_to_string(log_data.get("ai_generated_at")),
-        ai_model=log_data.get("ai_model"),
-        ai_confidence_score=log_data.get("ai_confidence_score"),
-        problem_category=log_data.get("problem_category"),
-        root_cause=log_data.get("root_cause"),
-        solution_steps=safe_json_parse(log_data.get("solution_steps")),
-        tools_required=safe_json_parse(log_data.get("tools_required")),
-        tags=safe_json_parse(log_data.get("tags")),
-        equipment_group=safe_json_parse(log_data.get("equipment_group")),
-        notes=log_data.get("notes"),
-        business_impact=log_data.get("business_impact"),
-        source_group_name=group_name,
-        source_group_id=group_id
+
+def get_group_db_configs(groups: list) -> Dict[str, Optional[dict]]:
+    """
+    Database configs for groups that are already loaded.
+
+    Read straight from each group's data, so no metadata query is needed;
+    the results also refresh the per-group cache used by create_log.
+    """
+    now = time.monotonic()
+    configs = {}
+    for group in groups:
+        configs[group.id] = group_database_config(group)
+        _group_database_cache[group.id] = (now, configs[group.id])
+    return configs
+
+
+def get_user_log_groups(user) -> list:
+    """Groups whose log databases the user can read"""
+    if user.role == "admin":
+        # Admins see all groups
+        return Groups.get_groups(filter={})
+
+    if user.role == "manager":
+        # Managers see their managed groups, loaded in one query
+        if not user.managed_groups:
+            return []
+        groups_by_id = Groups.get_groups_by_ids(user.managed_groups)
+        return [groups_by_id[gid] for gid in user.managed_groups if gid in groups_by_id]
+
+    # Regular users see groups they are members of
+    return Groups.get_groups(filter={"member_id": user.id})
+
+def group_groups_by_database(groups: list) -> tuple[list[tuple[dict, list]], list]:
+    """
+    Bucket groups by the database their connection config points at.
+
+    Returns ([(db_config, groups sharing that database), ...], groups without
+    a database). Groups in one bucket see the same tables, so each bucket
+    only needs to be queried once.
+    """
+    buckets: Dict[tuple, tuple[dict, list]] = {}
+    unconfigured = []
+    db_configs = get_group_db_configs(groups)
+
+    for group in groups:
+        db_config = db_configs[group.id]
+        if not db_config:
+            unconfigured.append(group)
+            continue
+
+        key = (
+            db_config["host"].lower(),
+            db_config["port"],
+            db_config["database"],
+            db_config["user"],
+        )
+        if key in buckets:
+            buckets[key][1].append(group)
+        else:
+            buckets[key] = (db_config, [group])
+
+    return list(buckets.values()), unconfigured
+
+
+# Explicitly select columns to avoid issues with the embedding vector column
+LOGS_SELECT_SQL = """
+SELECT id, session_id, user_name, insight_title, insight_content,
+       ai_generated_at, ai_model, ai_confidence_score, equipment_group,
+       problem_category, root_cause, solution_steps, tools_required,
+       verified, verification_method, verified_at, verified_by,
+       business_impact, tags, source, log_type, notes,
+       activation_status, created_at, updated_at
+FROM logs
+WHERE activation_status != 'deleted'{where}
+"""
+
+# One row per database with the number of logs matching the filters and their
+# distinct categories, independent of which page was requested. Categories
+# are ordered by code point (COLLATE "C") so lists from several databases can
+# be merged in Python without re-sorting
+LOG_FILTER_STATS_SQL = """
+SELECT (
+           SELECT COUNT(*)
+           FROM logs
+           WHERE activation_status != 'deleted'{where}
+       ) AS filter_total,
+       ARRAY(
+           SELECT DISTINCT problem_category COLLATE "C"
+           FROM logs
+           WHERE activation_status != 'deleted'
+           AND problem_category IS NOT NULL{where}
+           ORDER BY 1
+       ) AS filter_categories
+"""
+
+# get_logs filter conditions by name; {} is the parameter number.
+# The substring searches use ILIKE on the bare column so trigram indexes
+# can serve them where they exist:
+#   CREATE EXTENSION IF NOT EXISTS pg_trgm;
+#   CREATE INDEX idx_logs_insight_title_trgm ON logs USING gin (insight_title gin_trgm_ops);
+#   CREATE INDEX idx_logs_user_name_trgm ON logs USING gin (user_name gin_trgm_ops);
+LOG_FILTER_CONDITIONS = {
+    "category": " AND problem_category = ${}",
+    "business_impact": " AND business_impact = ${}",
+    "verified": " AND verified = ${}",
+    "equipment": " AND equipment_group @> ${}",
+    "user_filter": " AND user_name ILIKE ${}",
+    "title_search": " AND insight_title ILIKE ${}",
+    "date_after": " AND created_at::date >= ${}",
+    "date_before": " AND created_at::date <= ${}",
+}
+
+# Allowed get_logs sort columns and the ORDER BY clause for each direction.
+# Text columns sort by code point (COLLATE "C"), the order Python compares
+# str in, so pages from several databases merge correctly; the database's
+# default collation (e.g. en_US) ignores case and punctuation.
+LOG_SORT_FIELDS = ("created_at", "updated_at", "insight_title", "problem_category", "user_name")
+LOG_TEXT_SORT_FIELDS = frozenset(("insight_title", "problem_category", "user_name"))
+LOG_ORDER_BY_SQL = {
+    (field, desc): (
+        f" ORDER BY {field}"
+        + (' COLLATE "C"' if field in LOG_TEXT_SORT_FIELDS else "")
+        + (" DESC" if desc else "")
+    )
+    for field in LOG_SORT_FIELDS
+    for desc in (True, False)
+}
+
+# Sort columns that are never NULL and can be compared as-is
+LOG_NOT_NULL_SORT_FIELDS = frozenset(("created_at", "insight_title", "user_name"))
+
+
+def log_sort_key(sort_by: str):
+    """
+    Key that orders rows the way the database's ORDER BY sort_by does.
+
+    Nullable columns sort NULLs first when descending and last when
+    ascending, like Postgres; NOT NULL columns use a plain itemgetter.
+    Text columns compare by code point, matching their COLLATE "C" ORDER BY.
+    """
+    if sort_by in LOG_NOT_NULL_SORT_FIELDS:
+        return itemgetter(sort_by)
+
+    def nullable_key(row):
+        value = row[sort_by]
+        return (value is None, value)
+
+    return nullable_key
+
+
+def build_log_filter_sql(filters: tuple[str, ...]) -> str:
+    """AND conditions for the named filters, numbered in the order given"""
+    return "".join(
+        LOG_FILTER_CONDITIONS[name].format(index)
+        for index, name in enumerate(filters, start=1)
     )
 
+
+@lru_cache(maxsize=256)
+def build_log_filter_stats_query(filters: tuple[str, ...]) -> str:
+    """Build the get_logs total/categories SQL for one filter shape"""
+    return LOG_FILTER_STATS_SQL.format(where=build_log_filter_sql(filters))
+
+
+@lru_cache(maxsize=256)
+def build_logs_query(
+    filters: tuple[str, ...], sort_by: str, sort_desc: bool, with_offset: bool
+) -> str:
+    """
+    Build the get_logs SQL for one filter shape.
+
+    filters names the active filters in the order their parameters are bound,
+    followed by LIMIT (and OFFSET when with_offset). The same shape always
+    yields the same text, so asyncpg's per-connection prepared statement
+    cache skips the parse/plan step for repeated shapes.
+    """
+    parts = [
+        LOGS_SELECT_SQL.format(where=build_log_filter_sql(filters)),
+        LOG_ORDER_BY_SQL[(sort_by, sort_desc)],
+        f" LIMIT ${len(filters) + 1}",
+    ]
+    if with_offset:
+        parts.append(f" OFFSET ${len(filters) + 2}")
+
+    return "".join(parts)
+
+
+def merge_sorted_categories(category_lists) -> List[str]:
+    """Merge per-database category lists, each sorted and distinct, into one"""
+    return [category for category, _ in groupby(heapq.merge(*category_lists))]
+
+
+NUMBERED_LIST_START = re.compile(r'^\d+\.')
+NUMBERED_LIST_SPLIT = re.compile(r'\d+\.\s*')
+
+
+def safe_json_parse(json_str):
+    """Parse JSON string to list/dict safely"""
+    # jsonb columns already arrive decoded; only legacy text values need parsing
+    if json_str is None or isinstance(json_str, (list, dict)):
+        return json_str
+    if not isinstance(json_str, str):
+        return None
+
+    # First try to parse as JSON
+    try:
+        parsed = orjson.loads(json_str)
+    except orjson.JSONDecodeError:
+        # If JSON parsing fails, check if it looks like a numbered list
+        if NUMBERED_LIST_START.match(json_str.strip()):
+            # Split by numbered list pattern (1. 2. 3. etc)
+            items = NUMBERED_LIST_SPLIT.split(json_str)
+            return [item.strip() for item in items if item.strip()]
+        # Otherwise, treat as comma-separated string
+        return [item.strip() for item in json_str.split(',') if item.strip()]
+
+    # Ensure it's a list
+    if isinstance(parsed, list):
+        return parsed
+    # If it's a single value, wrap it in a list
+    return [parsed] if parsed else None
+
+
+def format_log_entry(row: Any, group_name: str, group_id: str) -> dict:
+    """Format a logs query row (asyncpg Record) into a LogResponse-shaped dict
+
+    Values come from our own database, so no model is built or validated;
+    orjson serializes the dict directly, timestamps as ISO 8601 strings;
+    a missing timestamp is sent as "" as the API always has.
+    Every column is selected explicitly by LOGS_SELECT_SQL, so the row is
+    indexed by key without defaults.
+    """
+    return {
+        "id": row["id"],
+        "session_id": row["session_id"],
+        "insight_title": row["insight_title"],
+        "insight_content": row["insight_content"],
+        "user_name": row["user_name"],
+        "created_at": row["created_at"] or "",
+        "updated_at": row["updated_at"] or "",
+        "source": row["source"],
+        "log_type": row["log_type"],
+        "activation_status": row["activation_status"],
+        "verified": row["verified"],
+        "verification_method": row["verification_method"],
+        "verified_at": row["verified_at"] or "",
+        "verified_by": row["verified_by"],
+        "ai_generated_at": row["ai_generated_at"] or "",
+        "ai_model": row["ai_model"],
+        # float() also covers numeric columns, which asyncpg returns as Decimal
+        "ai_confidence_score": (
+            float(row["ai_confidence_score"]) if row["ai_confidence_score"] is not None else None
+        ),
+        "problem_category": row["problem_category"],
+        "root_cause": row["root_cause"],
+        "solution_steps": safe_json_parse(row["solution_steps"]),
+        "tools_required": safe_json_parse(row["tools_required"]),
+        "tags": safe_json_parse(row["tags"]),
+        "equipment_group": safe_json_parse(row["equipment_group"]),
+        "notes": row["notes"],
+        "business_impact": row["business_impact"],
+        "source_group_name": group_name,
+        "source_group_id": group_id,
+    }
+
 def create_log_entry_data(request: LogCreationRequest, user: UserModel) -> dict:
-    """Create log entry dictionary from request and user context"""
-    now = datetime.utcnow()
+    """Create log entry dictionary from request and user context
 
+    created_at/updated_at are not included; the INSERT sets both to NOW().
+    """
     # Generate a session ID (required field, NOT NULL in schema)
     session_id = f"manual_{uuid.uuid4().hex[:16]}"
 
@@ -192,9 +442,7 @@ def create_log_entry_data(request: LogCreationRequest, user: UserModel) -> dict:
         "verified": False,
         "verification_method": "manual",
 
-        # Timestamps (let database handle defaults, but we can set them)
-        "created_at": now,
-        "updated_at": now,
+        # Timestamps (created_at/updated_at are set by the database)
         "ai_generated_at": None,
 
         # Optional verification fields
@@ -203,17 +451,48 @@ def create_log_entry_data(request: LogCreationRequest, user: UserModel) -> dict:
         "ai_model": None,
         "ai_confidence_score": None,
 
-        # User input fields (JSONB fields should be lists/dicts, not strings)
+        # User input fields (JSONB fields are lists, the pool's jsonb codec encodes them)
         "problem_category": request.problem_category,
         "root_cause": request.root_cause,
-        "solution_steps": json.dumps(request.solution_steps) if request.solution_steps else None,
-        "tools_required": json.dumps(request.tools_required) if request.tools_required else None,
-        "tags": json.dumps(request.tags) if request.tags else None,
-        "equipment_group": json.dumps(request.equipment_group) if request.equipment_group else None,
+        "solution_steps": request.solution_steps or None,
+        "tools_required": request.tools_required or None,
+        "tags": request.tags or None,
+        "equipment_group": request.equipment_group or None,
         "notes": request.notes,
         "business_impact": None,  # Not in request model, but exists in schema
     }
 
+
+# Column order of the INSERT; must match the keys of create_log_entry_data
+LOG_INSERT_COLUMNS = (
+    "session_id", "user_name", "insight_title", "insight_content",
+    "source", "log_type", "activation_status", "verified", "verification_method",
+    "ai_generated_at", "verified_at", "verified_by", "ai_model", "ai_confidence_score",
+    "problem_category", "root_cause", "solution_steps", "tools_required", "tags",
+    "equipment_group", "notes", "business_impact",
+)
+
+LOG_INSERT_SQL = (
+    f"INSERT INTO logs ({', '.join(LOG_INSERT_COLUMNS)}, created_at, updated_at) "
+    f"VALUES ({', '.join(f'${i}' for i in range(1, len(LOG_INSERT_COLUMNS) + 1))}, NOW(), NOW()) "
+    "RETURNING id"
+)
+
+# Bulk creation switches from per-row INSERTs to COPY at this many logs
+BULK_COPY_MIN_LOGS = 10
+
+# Session-local staging table for COPY, typed like the logs columns it feeds
+LOG_IMPORT_TABLE_SQL = (
+    f"CREATE TEMPORARY TABLE logs_import ON COMMIT DROP AS "
+    f"SELECT {', '.join(LOG_INSERT_COLUMNS)} FROM logs WITH NO DATA"
+)
+
+LOG_IMPORT_INSERT_SQL = (
+    f"INSERT INTO logs ({', '.join(LOG_INSERT_COLUMNS)}, created_at, updated_at) "
+    f"SELECT {', '.join(LOG_INSERT_COLUMNS)}, NOW(), NOW() FROM logs_import "
+    "RETURNING id"
+)
+
 ############################
 # API Endpoints
 ############################
@@ -242,19 +521,7 @@ async def get_logs(
 
     try:
         # Get user's groups with database configuration
-        if user.role == "admin":
-            # Admins see all groups
-            user_groups = Groups.get_groups(filter={})
-        elif user.role == "manager":
-            # Managers see their managed groups
-            if user.managed_groups:
-                user_groups = [Groups.get_group_by_id(gid) for gid in user.managed_groups]
-                user_groups = [g for g in user_groups if g is not None]
-            else:
-                user_groups = []
-        else:
-            # Regular users see groups they are members of
-            user_groups = Groups.get_groups(filter={"member_id": user.id})
+        user_groups = get_user_log_groups(user)
 
         # Filter to specific group if requested
         if group_id:
@@ -265,129 +532,149 @@ async def get_logs(
         debug_info.append(f"User {user.id} has {len(user_groups)} groups")
         logger.info(f"get_logs: User {user.id} has {len(user_groups)} groups")
         
-        all_logs = []
-        all_categories = set()
-        
-        # Fetch logs from each group's database
-        for group in user_groups:
-            debug_info.append(f"Processing group {group.id} ({group.name})")
-            logger.info(f"get_logs: Processing group {group.id} ({group.name})")
-            db_config = await get_group_database_connection(group.id)
-            if not db_config:
-                debug_info.append(f"Group {group.id} has no database configuration")
-                logger.info(f"get_logs: Group {group.id} has no database configuration")
-                continue
-            
-            debug_info.append(f"Group {group.id} has database configuration, querying logs")
-            logger.info(f"get_logs: Group {group.id} has database configuration, querying logs")
-            
-            try:
-                async with postgres_manager.get_connection(group.id, db_config) as conn:
-                    # Build query with filters
-                    # Explicitly select columns to avoid issues with the embedding vector column
-                    query = """
-                    SELECT id, session_id, user_name, insight_title, insight_content,
-                           ai_generated_at, ai_model, ai_confidence_score, equipment_group,
-                           problem_category, root_cause, solution_steps, tools_required,
-                           verified, verification_method, verified_at, verified_by,
-                           business_impact, tags, source, log_type, notes,
-                           activation_status, created_at, updated_at
-                    FROM logs
-                    WHERE activation_status != 'deleted'
-                    """
-                    query_params = []
-                    
-                    # Apply filters
-                    if category:
-                        query += " AND problem_category = $" + str(len(query_params) + 1)
-                        query_params.append(category)
-                    
-                    if business_impact:
-                        query += " AND business_impact = $" + str(len(query_params) + 1)
-                        query_params.append(business_impact)
-                    
-                    if verified is not None:
-                        query += " AND verified = $" + str(len(query_params) + 1)
-                        query_params.append(verified)
-                    
-                    if equipment:
-                        query += " AND equipment_group @> $" + str(len(query_params) + 1)
-                        query_params.append(f'["{equipment}"]')
-                    
-                    if user_filter:
-                        query += " AND LOWER(user_name) LIKE LOWER($" + str(len(query_params) + 1) + ")"
-                        query_params.append(f"%{user_filter}%")
-                    
-                    if title_search:
-                        query += " AND LOWER(insight_title) LIKE LOWER($" + str(len(query_params) + 1) + ")"
-                        query_params.append(f"%{title_search}%")
-                    
-                    if date_after:
-                        # Convert string date to Python date object for asyncpg
-                        date_after_obj = datetime.strptime(date_after, "%Y-%m-%d").date()
-                        query += " AND created_at::date >= $" + str(len(query_params) + 1)
-                        query_params.append(date_after_obj)
-                    
-                    if date_before:
-                        # Convert string date to Python date object for asyncpg
-                        date_before_obj = datetime.strptime(date_before, "%Y-%m-%d").date()
-                        query += " AND created_at::date <= $" + str(len(query_params) + 1)
-                        query_params.append(date_before_obj)
-                    
-                    # Add sorting
-                    valid_sort_fields = ["created_at", "updated_at", "insight_title", "problem_category", "user_name"]
-                    if sort_by not in valid_sort_fields:
-                        sort_by = "created_at"
-                    
-                    query += f" ORDER BY {sort_by}"
-                    if sort_desc:
-                        query += " DESC"
-                    
-                    
-                    # Add pagination
-                    query += " LIMIT $" + str(len(query_params) + 1)
-                    query_params.append(limit)
-                    
-                    if offset > 0:
-                        query += " OFFSET $" + str(len(query_params) + 1)
-                        query_params.append(offset)
-                    
-                    # Execute query
-                    logger.info(f"get_logs: Executing query: {query} with params: {query_params}")
-                    rows = await conn.fetch(query, *query_params)
-                    debug_info.append(f"Query returned {len(rows)} logs from group {group.id}")
-                    logger.info(f"get_logs: Query returned {len(rows)} logs from group {group.id}")
-                    
-                    # Format results
-                    for row in rows:
-                        log_dict = dict(row)
-                        formatted_log = format_log_entry(log_dict, group.name, group.id)
-                        all_logs.append(formatted_log)
-                        
-                        # Collect categories
-                        if log_dict.get("problem_category"):
-                            all_categories.add(log_dict["problem_category"])
-                
-            except Exception as e:
-                logger.error(f"Error fetching logs from group {group.name} ({group.id}): {e}")
+        category_lists = []
+
+        databases, unconfigured_groups = group_groups_by_database(user_groups)
+
+        for group in unconfigured_groups:
+            debug_info.append(f"Group {group.id} ({group.name}) has no database configuration")
+            logger.info(f"get_logs: Group {group.id} has no database configuration")
+
+        # A single source can be paged by the database. With several, each one
+        # returns its first offset + limit rows and the sorted results are merged
+        single_source = len(databases) == 1 and len(databases[0][1]) == 1
+
+        # Collect the filters that are present and their parameters, in order.
+        # The SQL text depends only on which filters are present, not on their values
+        filters = []
+        query_params = []
+
+        if category:
+            filters.append("category")
+            query_params.append(category)
+
+        if business_impact:
+            filters.append("business_impact")
+            query_params.append(business_impact)
+
+        if verified is not None:
+            filters.append("verified")
+            query_params.append(verified)
+
+        if equipment:
+            filters.append("equipment")
+            query_params.append([equipment])
+
+        if user_filter:
+            filters.append("user_filter")
+            query_params.append(f"%{user_filter}%")
+
+        if title_search:
+            filters.append("title_search")
+            query_params.append(f"%{title_search}%")
+
+        if date_after:
+            # Convert string date to Python date object for asyncpg
+            filters.append("date_after")
+            query_params.append(datetime.strptime(date_after, "%Y-%m-%d").date())
+
+        if date_before:
+            # Convert string date to Python date object for asyncpg
+            filters.append("date_before")
+            query_params.append(datetime.strptime(date_before, "%Y-%m-%d").date())
+
+        # Add sorting
+        if sort_by not in LOG_SORT_FIELDS:
+            sort_by = "created_at"
+
+        # The total and categories only take the filter parameters
+        stats_params = list(query_params)
+        stats_query = build_log_filter_stats_query(tuple(filters))
+
+        # Add pagination
+        if single_source:
+            query_params.append(limit)
+            if offset > 0:
+                query_params.append(offset)
+        else:
+            query_params.append(limit + offset)
+
+        query = build_logs_query(
+            tuple(filters), sort_by, sort_desc, single_source and offset > 0
+        )
+
+        logger.info(f"get_logs: Executing query: {query} with params: {query_params}")
+
+        async def fetch_page(db_config, groups):
+            async with postgres_manager.get_connection(groups[0].id, db_config) as conn:
+                return await conn.fetch(query, *query_params)
+
+        async def fetch_filter_stats(db_config, groups):
+            async with postgres_manager.get_connection(groups[0].id, db_config) as conn:
+                return await conn.fetchrow(stats_query, *stats_params)
+
+        async def fetch_database_logs(db_config, groups):
+            """
+            Run the page and total/categories queries once against a database
+            shared by groups, on two pooled connections at the same time
+            """
+            return await asyncio.gather(
+                fetch_page(db_config, groups), fetch_filter_stats(db_config, groups)
+            )
+
+        # Query each distinct database once, all of them concurrently
+        results = await asyncio.gather(
+            *[fetch_database_logs(db_config, groups) for db_config, groups in databases],
+            return_exceptions=True
+        )
+
+        # One (sort key, row, group) sequence per group, each already sorted
+        # by the database
+        sort_key = log_sort_key(sort_by)
+        sources = []
+        total_logs = 0
+
+        for (db_config, groups), result in zip(databases, results):
+            if isinstance(result, BaseException):
+                for group in groups:
+                    logger.error(f"Error fetching logs from group {group.name} ({group.id}): {result}")
                 continue
-        
-        # Sort combined results if multiple groups
-        if len([g for g in user_groups if Groups.get_group_by_id(g.id)]) > 1:
-            reverse = sort_desc
-            all_logs.sort(key=lambda x: getattr(x, sort_by, ""), reverse=reverse)
-        
-        # Apply final pagination if needed
-        total_logs = len(all_logs)
-        if len(all_logs) > limit:
-            all_logs = all_logs[:limit]
-        
-        return LogsListResponse(
-            logs=all_logs,
-            total=total_logs,
-            has_more=total_logs > limit,
-            categories=sorted(list(all_categories)),
-            debug_info=debug_info
+
+            rows, stats = result
+
+            # The logs table has no group column, so every group sharing the
+            # database sees the same rows
+            for group in groups:
+                debug_info.append(f"Query returned {len(rows)} logs from group {group.id} ({group.name})")
+                logger.info(f"get_logs: Query returned {len(rows)} logs from group {group.id}")
+                sources.append(zip(map(sort_key, rows), rows, repeat(group)))
+
+            category_lists.append(stats["filter_categories"])
+            total_logs += stats["filter_total"] * len(groups)
+
+        if single_source:
+            # Already sorted and paged by the database
+            page = sources[0] if sources else []
+        else:
+            page = islice(
+                heapq.merge(*sources, key=itemgetter(0), reverse=sort_desc),
+                offset,
+                offset + limit,
+            )
+
+        # Only the rows that end up in the response are formatted
+        all_logs = [format_log_entry(row, group.name, group.id) for _, row, group in page]
+
+        # Returned directly so FastAPI does not re-validate every log against
+        # LogsListResponse; the model still documents the response shape
+        return ORJSONResponse(
+            content={
+                "logs": all_logs,
+                "total": total_logs,
+                "has_more": offset + len(all_logs) < total_logs,
+                "categories": merge_sorted_categories(category_lists),
+                "debug_info": debug_info,
+            }
         )
         
     except Exception as e:
@@ -397,6 +684,39 @@ async def get_logs(
             detail=ERROR_MESSAGES.DEFAULT(f"Error retrieving logs: {str(e)}"),
         )
 
+async def get_writable_group_database(user, group_id: str) -> dict:
+    """Check the user may create logs in the group and return its database config"""
+    # Verify user access to group
+    if user.role == "admin":
+        # Admins have access to all groups
+        pass
+    elif user.role == "manager":
+        # Managers have access to their managed groups
+        if not user.managed_groups or group_id not in user.managed_groups:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=ERROR_MESSAGES.DEFAULT("Access denied to group"),
+            )
+    else:
+        # Regular users have access to groups they are members of
+        user_groups = Groups.get_groups_by_member_id(user.id)
+        user_group_ids = [g.id for g in user_groups]
+        if group_id not in user_group_ids:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=ERROR_MESSAGES.DEFAULT("Access denied to group"),
+            )
+
+    # Get database configuration
+    db_config = await get_group_database_connection(group_id)
+    if not db_config:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.DEFAULT("Database not configured for group"),
+        )
+    return db_config
+
+
 @router.post("/", response_model=dict)
 async def create_log(
     log_data: LogCreationRequest,
@@ -405,49 +725,20 @@ async def create_log(
 ):
     """Create new log entry in group's database"""
     try:
-        # Verify user access to group
-        if user.role == "admin":
-            # Admins have access to all groups
-            pass
-        elif user.role == "manager":
-            # Managers have access to their managed groups
-            if not user.managed_groups or group_id not in user.managed_groups:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=ERROR_MESSAGES.DEFAULT("Access denied to group"),
-                )
-        else:
-            # Regular users have access to groups they are members of
-            user_groups = Groups.get_groups_by_member_id(user.id)
-            user_group_ids = [g.id for g in user_groups]
-            if group_id not in user_group_ids:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=ERROR_MESSAGES.DEFAULT("Access denied to group"),
-                )
-        
-        # Get database configuration
-        db_config = await get_group_database_connection(group_id)
-        if not db_config:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=ERROR_MESSAGES.DEFAULT("Database not configured for group"),
-            )
+        db_config = await get_writable_group_database(user, group_id)
         
         # Create log entry data
         log_entry = create_log_entry_data(log_data, user)
         
         # Insert into database
         async with postgres_manager.get_connection(group_id, db_config) as conn:
-            # Prepare insert query
-            columns = list(log_entry.keys())
-            placeholders = ", ".join(f"${i+1}" for i in range(len(columns)))
-            query = f"INSERT INTO logs ({', '.join(columns)}) VALUES ({placeholders}) RETURNING id"
-            
-            # Execute insert
-            result = await conn.fetchrow(query, *log_entry.values())
+            result = await conn.fetchrow(
+                LOG_INSERT_SQL, *[log_entry[column] for column in LOG_INSERT_COLUMNS]
+            )
             
             if result:
+                # The new log may introduce a category
+                _categories_cache.clear()
                 logger.info(f"Created log entry {result['id']} in group {group_id} by user {user.id}")
                 return {
                     "success": True,
@@ -469,54 +760,108 @@ async def create_log(
             detail=ERROR_MESSAGES.DEFAULT(f"Error creating log: {str(e)}"),
         )
 
+@router.post("/bulk", response_model=dict)
+async def create_logs_bulk(
+    form_data: BulkLogCreationRequest,
+    group_id: str = Query(..., description="Target group ID"),
+    user=Depends(get_verified_user)
+):
+    """Create several log entries in group's database in one transaction"""
+    try:
+        db_config = await get_writable_group_database(user, group_id)
+
+        records = [
+            tuple(entry[column] for column in LOG_INSERT_COLUMNS)
+            for entry in (create_log_entry_data(log, user) for log in form_data.logs)
+        ]
+
+        async with postgres_manager.get_connection(group_id, db_config) as conn:
+            async with conn.transaction():
+                if len(records) < BULK_COPY_MIN_LOGS:
+                    log_ids = [await conn.fetchval(LOG_INSERT_SQL, *record) for record in records]
+                else:
+                    # COPY has no NOW(), so rows go through a temporary table
+                    # and the INSERT ... SELECT fills in the timestamps
+                    await conn.execute(LOG_IMPORT_TABLE_SQL)
+                    await conn.copy_records_to_table(
+                        "logs_import", records=records, columns=LOG_INSERT_COLUMNS
+                    )
+                    log_ids = [row["id"] for row in await conn.fetch(LOG_IMPORT_INSERT_SQL)]
+
+        # The new logs may introduce categories
+        _categories_cache.clear()
+        logger.info(f"Created {len(log_ids)} log entries in group {group_id} by user {user.id}")
+        return {
+            "success": True,
+            "log_ids": log_ids,
+            "message": f"Created {len(log_ids)} logs successfully"
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error bulk creating logs in group {group_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ERROR_MESSAGES.DEFAULT(f"Error creating logs: {str(e)}"),
+        )
+
 @router.get("/categories", response_model=List[str])
 async def get_problem_categories(user=Depends(get_verified_user)):
     """Get unique problem categories from user's accessible group databases"""
     try:
         # Get user's groups with database configuration
-        if user.role == "admin":
-            # Admins see all groups
-            user_groups = Groups.get_groups(filter={})
-        elif user.role == "manager":
-            # Managers see their managed groups
-            if user.managed_groups:
-                user_groups = [Groups.get_group_by_id(gid) for gid in user.managed_groups]
-                user_groups = [g for g in user_groups if g is not None]
-            else:
-                user_groups = []
-        else:
-            # Regular users see groups they are members of
-            user_groups = Groups.get_groups(filter={"member_id": user.id})
+        user_groups = get_user_log_groups(user)
+
+        cache_key = frozenset(group.id for group in user_groups)
+        now = time.monotonic()
+        cached = _categories_cache.get(cache_key)
+        if cached and now - cached[0] < FILTER_OPTIONS_CACHE_TTL:
+            return cached[1]
+
+        category_lists = []
+        complete = True
+
+        query = """
+        SELECT DISTINCT problem_category COLLATE "C" AS problem_category
+        FROM logs
+        WHERE problem_category IS NOT NULL
+        AND activation_status != 'deleted'
+        ORDER BY problem_category
+        """
+
+        databases, _ = group_groups_by_database(user_groups)
+
+        async def fetch_database_categories(db_config, groups):
+            async with postgres_manager.get_connection(groups[0].id, db_config) as conn:
+                return await conn.fetch(query)
+
+        # Fetch categories once per distinct database, all concurrently
+        results = await asyncio.gather(
+            *[fetch_database_categories(db_config, groups) for db_config, groups in databases],
+            return_exceptions=True
+        )
 
-        all_categories = set()
-        
-        # Fetch categories from each group's database
-        for group in user_groups:
-            db_config = await get_group_database_connection(group.id)
-            if not db_config:
-                continue
-            
-            try:
-                async with postgres_manager.get_connection(group.id, db_config) as conn:
-                    query = """
-                    SELECT DISTINCT problem_category 
-                    FROM logs 
-                    WHERE problem_category IS NOT NULL 
-                    AND activation_status != 'deleted'
-                    ORDER BY problem_category
-                    """
-                    
-                    rows = await conn.fetch(query)
-                    for row in rows:
-                        if row["problem_category"]:
-                            all_categories.add(row["problem_category"])
-                
-            except Exception as e:
-                logger.error(f"Error fetching categories from group {group.name}: {e}")
+        for (db_config, groups), rows in zip(databases, results):
+            if isinstance(rows, BaseException):
+                logger.error(
+                    f"Error fetching categories from groups {', '.join(g.name for g in groups)}: {rows}"
+                )
+                complete = False
                 continue
-        
-        return sorted(list(all_categories))
-        
+
+            category_lists.append([row["problem_category"] for row in rows if row["problem_category"]])
+
+        categories = merge_sorted_categories(category_lists)
+
+        # Partial results from a failing database are not cached
+        if complete:
+            if len(_categories_cache) >= FILTER_OPTIONS_CACHE_MAX_SIZE:
+                _categories_cache.clear()
+            _categories_cache[cache_key] = (now, categories)
+
+        return categories
+
     except Exception as e:
         logger.exception(f"Error getting problem categories for user {user.id}: {e}")
         raise HTTPException(
@@ -563,66 +908,85 @@ async def get_equipment_groups(
             user_groups = [group]
         else:
             # Original logic - fetch from all accessible groups
-            if user.role == "admin":
-                # Admins see all groups
-                user_groups = Groups.get_groups(filter={})
-            elif user.role == "manager":
-                # Managers see their managed groups
-                if user.managed_groups:
-                    user_groups = [Groups.get_group_by_id(gid) for gid in user.managed_groups]
-                    user_groups = [g for g in user_groups if g is not None]
-                else:
-                    user_groups = []
-            else:
-                # Regular users see groups they are members of
-                user_groups = Groups.get_groups(filter={"member_id": user.id})
+            user_groups = get_user_log_groups(user)
+
+        cache_key = (frozenset(group.id for group in user_groups), search)
+        now = time.monotonic()
+        cached = _equipment_cache.get(cache_key)
+        if cached and now - cached[0] < FILTER_OPTIONS_CACHE_TTL:
+            return ORJSONResponse(content=cached[1])
 
         all_equipment = {}  # Use dict to avoid duplicates by conventional_name
-        
-        # Fetch equipment from each group's database
-        for group in user_groups:
-            db_config = await get_group_database_connection(group.id)
-            if not db_config:
-                continue
-            
-            try:
-                async with postgres_manager.get_connection(group.id, db_config) as conn:
-                    query = """
-                    SELECT id, conventional_name, model_numbers, aliases
-                    FROM equipment_groups 
-                    WHERE activation_status = 'active'
-                    """
-                    query_params = []
-                    
-                    if search:
-                        query += """ AND (
-                            LOWER(conventional_name) LIKE LOWER($1) OR
-                            EXISTS (
-                                SELECT 1 FROM unnest(aliases) AS alias 
-                                WHERE LOWER(alias) LIKE LOWER($1)
-                            )
-                        )"""
-                        query_params.append(f"%{search}%")
-                    
-                    query += " ORDER BY conventional_name"
-                    
-                    rows = await conn.fetch(query, *query_params)
-                    for row in rows:
-                        equipment_key = row["conventional_name"]
-                        if equipment_key not in all_equipment:
-                            all_equipment[equipment_key] = EquipmentGroupResponse(
-                                id=row["id"],
-                                conventional_name=row["conventional_name"],
-                                model_numbers=row["model_numbers"] or [],
-                                aliases=row["aliases"] or []
-                            )
-                
-            except Exception as e:
-                logger.error(f"Error fetching equipment from group {group.name}: {e}")
+        complete = True
+
+        # DISTINCT ON lets each database return one row per name
+        query = """
+        SELECT DISTINCT ON (conventional_name) id, conventional_name, model_numbers, aliases
+        FROM equipment_groups
+        WHERE activation_status = 'active'
+        """
+        query_params = []
+
+        if search:
+            # ILIKE on the bare column (rather than LOWER(col) LIKE ...) lets a
+            # trigram index serve the leading-wildcard search where one exists:
+            #   CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            #   CREATE INDEX idx_equipment_groups_name_trgm
+            #       ON equipment_groups USING gin (conventional_name gin_trgm_ops);
+            query += """ AND (
+                conventional_name ILIKE $1 OR
+                EXISTS (
+                    SELECT 1 FROM unnest(aliases) AS alias
+                    WHERE alias ILIKE $1
+                )
+            )"""
+            query_params.append(f"%{search}%")
+
+        query += " ORDER BY conventional_name, id"
+
+        databases, _ = group_groups_by_database(user_groups)
+
+        async def fetch_database_equipment(db_config, groups):
+            async with postgres_manager.get_connection(groups[0].id, db_config) as conn:
+                return await conn.fetch(query, *query_params)
+
+        # Fetch equipment once per distinct database, all concurrently
+        results = await asyncio.gather(
+            *[fetch_database_equipment(db_config, groups) for db_config, groups in databases],
+            return_exceptions=True
+        )
+
+        for (db_config, groups), rows in zip(databases, results):
+            if isinstance(rows, BaseException):
+                logger.error(
+                    f"Error fetching equipment from groups {', '.join(g.name for g in groups)}: {rows}"
+                )
+                complete = False
                 continue
-        
-        return list(all_equipment.values())
-        
+
+            # Names are unique per database; only other databases can repeat them
+            for row in rows:
+                all_equipment.setdefault(row["conventional_name"], row)
+
+        # Plain dicts in the EquipmentGroupResponse shape, serialized directly
+        equipment = [
+            {
+                "id": row["id"],
+                "conventional_name": row["conventional_name"],
+                "model_numbers": row["model_numbers"] or [],
+                "aliases": row["aliases"] or [],
+            }
+            for row in all_equipment.values()
+        ]
+
+        # Partial results from a failing database are not cached
+        if complete:
+            if len(_equipment_cache) >= FILTER_OPTIONS_CACHE_MAX_SIZE:
+                _equipment_cache.clear()
+            _equipment_cache[cache_key] = (now, equipment)
+
+        return ORJSONResponse(content=equipment)
+
     except Exception as e:
         logger.exception(f"Error getting equipment groups for user {user.id}: {e}")
         raise HTTPException(
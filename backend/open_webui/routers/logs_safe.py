@@ -22,88 +22,73 @@ except ImportError as e:
     logger.warning(f"PostgreSQL dependencies not available: {e}")
     logger.warning("Logs endpoints will return appropriate error messages")
 
-@router.get("/")
-async def get_logs():
-    """Get logs endpoint with dependency check"""
-    if not POSTGRES_AVAILABLE:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Logs functionality requires PostgreSQL dependencies. Please install asyncpg and configure the database connection."
-        )
-    
-    # Import the actual router only if dependencies are available
+# Resolve the implementation once at import instead of importing per request
+_logs_impl = None
+if POSTGRES_AVAILABLE:
     try:
-        from open_webui.routers.logs import get_logs_impl
-        return await get_logs_impl()
+        from open_webui.routers import logs as _logs_impl
     except Exception as e:
-        logger.error(f"Error in logs implementation: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Logs service is currently unavailable"
-        )
+        logger.warning(f"Logs implementation not available: {e}")
 
-@router.post("/")
-async def create_log():
-    """Create log endpoint with dependency check"""
-    if not POSTGRES_AVAILABLE:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Logs functionality requires PostgreSQL dependencies. Please install asyncpg and configure the database connection."
-        )
-    
-    try:
-        from open_webui.routers.logs import create_log_impl
-        return await create_log_impl()
-    except Exception as e:
-        logger.error(f"Error in logs implementation: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Logs service is currently unavailable"
-        )
+# Error details, shared by every handler
+UNAVAILABLE_DETAIL = (
+    "Logs functionality requires PostgreSQL dependencies. "
+    "Please install asyncpg and configure the database connection."
+)
+UNAVAILABLE_DETAIL_SHORT = "Logs functionality requires PostgreSQL dependencies."
+IMPL_ERROR_DETAIL = "Logs service is currently unavailable"
 
-@router.get("/categories")
-async def get_problem_categories():
-    """Get problem categories endpoint with dependency check"""
-    if not POSTGRES_AVAILABLE:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Logs functionality requires PostgreSQL dependencies."
-        )
-    
-    try:
-        from open_webui.routers.logs import get_problem_categories_impl
-        return await get_problem_categories_impl()
-    except Exception as e:
-        logger.error(f"Error in logs implementation: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Logs service is currently unavailable"
-        )
 
-@router.get("/equipment-groups")
-async def get_equipment_groups():
-    """Get equipment groups endpoint with dependency check"""
+def _raise_unavailable(unavailable_detail: str):
+    """Fail with the error matching why the logs implementation is missing"""
     if not POSTGRES_AVAILABLE:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Logs functionality requires PostgreSQL dependencies."
-        )
-    
-    try:
-        from open_webui.routers.logs import get_equipment_groups_impl
-        return await get_equipment_groups_impl()
-    except Exception as e:
-        logger.error(f"Error in logs implementation: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Logs service is currently unavailable"
+            detail=unavailable_detail,
         )
 
+    raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=IMPL_ERROR_DETAIL,
+    )
+
+
+if _logs_impl is not None:
+    # Serve the real handlers, with their own parameters and dependencies
+    router.include_router(_logs_impl.router)
+else:
+    @router.get("/")
+    async def get_logs():
+        """Get logs endpoint with dependency check"""
+        _raise_unavailable(UNAVAILABLE_DETAIL)
+
+    @router.post("/")
+    async def create_log():
+        """Create log endpoint with dependency check"""
+        _raise_unavailable(UNAVAILABLE_DETAIL)
+
+    @router.get("/categories")
+    async def get_problem_categories():
+        """Get problem categories endpoint with dependency check"""
+        _raise_unavailable(UNAVAILABLE_DETAIL_SHORT)
+
+    @router.get("/equipment-groups")
+    async def get_equipment_groups():
+        """Get equipment groups endpoint with dependency check"""
+        _raise_unavailable(UNAVAILABLE_DETAIL_SHORT)
+
 @router.get("/health")
 async def logs_health_check() -> Dict[str, Any]:
     """Health check endpoint for logs functionality"""
+    if _logs_impl is not None:
+        message = "Logs functionality is ready"
+    elif POSTGRES_AVAILABLE:
+        message = IMPL_ERROR_DETAIL
+    else:
+        message = "PostgreSQL dependencies missing"
+
     return {
-        "status": "available" if POSTGRES_AVAILABLE else "unavailable",
+        "status": "available" if _logs_impl is not None else "unavailable",
         "postgresql_dependencies": POSTGRES_AVAILABLE,
-        "message": "Logs functionality is ready" if POSTGRES_AVAILABLE else "PostgreSQL dependencies missing"
-    }
\ No newline at end of file
+        "message": message
+    }
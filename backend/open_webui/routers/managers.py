@@ -16,6 +16,7 @@ import time
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, EmailStr
 
 from open_webui.models.users import Users, UserModel
@@ -33,7 +34,7 @@ from open_webui.utils.access_control import get_permissions
 from open_webui.constants import ERROR_MESSAGES
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 ############################
@@ -86,35 +87,58 @@ class GroupMemberResponse(BaseModel):
 ############################
 
 
-def format_pending_user(user: UserModel) -> PendingUserResponse:
-    """Format pending user with group details"""
-    group_name = None
-    if user.pending_group_id:
-        group = Groups.get_group_by_id(user.pending_group_id)
-        group_name = group.name if group else None
-
-    return PendingUserResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        role=user.role,
-        pending_group_id=user.pending_group_id,
-        pending_group_name=group_name,
-        profile_image_url=user.profile_image_url,
-        created_at=user.created_at
-    )
+def format_pending_user(user: UserModel, group_names: dict[str, str]) -> dict:
+    """Format pending user with group details from a group id -> name map
+
+    Fields come from an already validated UserModel, so the PendingUserResponse
+    shape is built as a plain dict and serialized by orjson without validation.
+    """
+    group_name = group_names.get(user.pending_group_id) if user.pending_group_id else None
+
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "role": user.role,
+        "pending_group_id": user.pending_group_id,
+        "pending_group_name": group_name,
+        "profile_image_url": user.profile_image_url,
+        "created_at": user.created_at,
+    }
+
+
+def format_group_member(user: UserModel) -> dict:
+    """Format group member in the GroupMemberResponse shape, as a plain dict"""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "role": user.role,
+        "profile_image_url": user.profile_image_url,
+        "last_active_at": user.last_active_at,
+        "created_at": user.created_at,
+    }
+
 
+def raise_for_unmanageable_user(user_id: str, action: str):
+    """Raise the 404 or 403 explaining why a manager cannot act on the user"""
+    target_user = Users.get_user_by_id(user_id)
+
+    if not target_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
 
-def format_group_member(user: UserModel) -> GroupMemberResponse:
-    """Format group member response"""
-    return GroupMemberResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        role=user.role,
-        profile_image_url=user.profile_image_url,
-        last_active_at=user.last_active_at,
-        created_at=user.created_at
+    if target_user.role == "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Managers cannot {action} admin users"
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"You do not have permission to {action} this user"
     )
 
 
@@ -123,7 +147,9 @@ def format_group_member(user: UserModel) -> GroupMemberResponse:
 ############################
 
 
-@router.get("/pending-users", response_model=List[PendingUserResponse])
+# Returns ORJSONResponse directly so the output is not re-validated against a
+# response_model; responses= keeps the schema in the API docs
+@router.get("/pending-users", responses={200: {"model": List[PendingUserResponse]}})
 async def get_pending_users(
     user=Depends(get_admin_or_manager_user)
 ):
@@ -135,13 +161,36 @@ async def get_pending_users(
     """
     if is_admin(user):
         # Admin sees all pending users
-        all_users = Users.get_users()
-        pending_users = [u for u in all_users if u.role == "pending"]
+        pending_users = Users.get_pending_users()
     else:
         # Manager sees only their group's pending users
         pending_users = get_pending_users_for_manager(user)
 
-    return [format_pending_user(u) for u in pending_users]
+    # Resolve all pending group names in one query
+    group_names = Groups.get_group_names_by_ids(
+        list({u.pending_group_id for u in pending_users if u.pending_group_id})
+    )
+
+    return ORJSONResponse([format_pending_user(u, group_names) for u in pending_users])
+
+
+@router.get("/pending-users/exists")
+async def has_pending_users(
+    user=Depends(get_admin_or_manager_user)
+):
+    """
+    Check whether there are pending users to review, without listing them.
+
+    Uses the same visibility rules as /pending-users.
+    """
+    if is_admin(user):
+        has_pending = Users.has_pending_users()
+    elif user.managed_groups:
+        has_pending = Users.has_pending_users(user.managed_groups)
+    else:
+        has_pending = False
+
+    return {"has_pending_users": has_pending}
 
 
 @router.post("/approve-user")
@@ -178,16 +227,15 @@ async def approve_user(
                 detail="You do not have permission to approve this user"
             )
 
-    # Update user role to 'user'
-    Users.update_user_by_id(request.user_id, {"role": "user"})
-
-    # Add user to their pending group if specified
-    if pending_user.pending_group_id:
-        GroupMembers.add_user_to_group(request.user_id, pending_user.pending_group_id)
-        # Clear pending_group_id after adding to group
-        Users.update_user_by_id(request.user_id, {"pending_group_id": None})
+    # Promote to 'user', clear pending_group_id and join the pending group
+    # in one transaction, so a failure never leaves a half-approved user
+    if not Users.approve_pending_user(request.user_id, pending_user.pending_group_id):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to approve user"
+        )
 
-    logger.info(f"User {request.user_id} approved by manager {manager.id}")
+    logger.info("User %s approved by manager %s", request.user_id, manager.id)
 
     return {
         "success": True,
@@ -230,11 +278,15 @@ async def reject_user(
                 detail="You do not have permission to reject this user"
             )
 
-    # Delete the user
-    Users.delete_user_by_id(user_id)
-    Auths.delete_auth_by_id(user_id)
+    # Delete the user; delete_auth_by_id removes the user row (with their
+    # chats and group memberships) before the auth row
+    if not Auths.delete_auth_by_id(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ERROR_MESSAGES.DELETE_USER_ERROR
+        )
 
-    logger.info(f"User {user_id} rejected and deleted by manager {manager.id}")
+    logger.info("User %s rejected and deleted by manager %s", user_id, manager.id)
 
     return {
         "success": True,
@@ -242,7 +294,8 @@ async def reject_user(
     }
 
 
-@router.get("/groups/{group_id}/members", response_model=List[GroupMemberResponse])
+# Serialized directly like /pending-users
+@router.get("/groups/{group_id}/members", responses={200: {"model": List[GroupMemberResponse]}})
 async def get_group_members(
     group_id: str,
     manager=Depends(get_admin_or_manager_user)
@@ -259,12 +312,10 @@ async def get_group_members(
             detail="You do not have permission to view this group's members"
         )
 
-    # Get group members
-    members = GroupMembers.get_group_members(group_id)
-    member_users = [Users.get_user_by_id(m.user_id) for m in members]
-    member_users = [u for u in member_users if u]  # Filter out None
+    # Get group members with a single join instead of one lookup per member
+    member_users = Users.get_users_by_group_id(group_id)
 
-    return [format_group_member(u) for u in member_users]
+    return ORJSONResponse([format_group_member(u) for u in member_users])
 
 
 @router.post("/groups/{group_id}/add-user")
@@ -285,25 +336,24 @@ async def add_user_to_group(
             detail="You do not have permission to add users to this group"
         )
 
-    # Verify user exists
-    user = Users.get_user_by_id(request.user_id)
-    if not user:
+    # Add user to group; existence and membership are checked in one query
+    result = GroupMembers.add_user_to_group_if_absent(request.user_id, group_id)
+
+    if result == "no_user":
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    # Check if user is already in group
-    if GroupMembers.is_user_in_group(request.user_id, group_id):
+    if result == "exists":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is already in this group"
         )
 
-    # Add user to group
-    GroupMembers.add_user_to_group(request.user_id, group_id)
-
-    logger.info(f"User {request.user_id} added to group {group_id} by manager {manager.id}")
+    logger.info(
+        "User %s added to group %s by manager %s", request.user_id, group_id, manager.id
+    )
 
     return {
         "success": True,
@@ -354,7 +404,9 @@ async def remove_user_from_group(
     # Remove user from group
     GroupMembers.remove_user_from_group(user_id, group_id)
 
-    logger.info(f"User {user_id} removed from group {group_id} by manager {manager.id}")
+    logger.info(
+        "User %s removed from group %s by manager %s", user_id, group_id, manager.id
+    )
 
     return {
         "success": True,
@@ -366,6 +418,7 @@ async def remove_user_from_group(
 async def edit_user(
     user_id: str,
     request: EditUserRequest,
+    http_request: Request,
     manager=Depends(get_admin_or_manager_user)
 ):
     """
@@ -373,28 +426,18 @@ async def edit_user(
 
     Manager can only edit users in groups they manage.
     """
-    # Get the user
-    target_user = Users.get_user_by_id(user_id)
-
-    if not target_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-
-    # Prevent managers from editing admin users
-    if target_user.role == "admin" and not is_admin(manager):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Managers cannot edit admin users"
-        )
+    admin = is_admin(manager)
 
-    # Check permissions
-    if not is_admin(manager) and not can_manage_user(manager, user_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to edit this user"
-        )
+    # Managers are checked for group membership here; the "not an admin"
+    # check is part of the UPDATE below, so the target is not fetched first
+    if admin:
+        if not Users.get_user_by_id(user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+    elif not can_manage_user(manager, user_id, http_request):
+        raise_for_unmanageable_user(user_id, "edit")
 
     # Build update dict
     updates = {}
@@ -412,14 +455,22 @@ async def edit_user(
 
     # Update user
     if updates:
-        Users.update_user_by_id(user_id, updates)
+        if admin:
+            Users.update_user_by_id(user_id, updates)
+        elif not Users.update_non_admin_user_by_id(user_id, updates):
+            raise_for_unmanageable_user(user_id, "edit")
+    elif not admin:
+        # Password-only edit: no UPDATE to carry the admin check
+        target_user = Users.get_user_by_id(user_id)
+        if not target_user or target_user.role == "admin":
+            raise_for_unmanageable_user(user_id, "edit")
 
     # Update password separately if provided
     if request.password:
         hashed = get_password_hash(request.password)
         Auths.update_user_password_by_id(user_id, hashed)
 
-    logger.info(f"User {user_id} edited by manager {manager.id}")
+    logger.info("User %s edited by manager %s", user_id, manager.id)
 
     return {
         "success": True,
@@ -430,6 +481,7 @@ async def edit_user(
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: str,
+    http_request: Request,
     manager=Depends(get_admin_or_manager_user)
 ):
     """
@@ -454,17 +506,21 @@ async def delete_user(
         )
 
     # Check permissions
-    if not is_admin(manager) and not can_manage_user(manager, user_id):
+    if not is_admin(manager) and not can_manage_user(manager, user_id, http_request):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to delete this user"
         )
 
-    # Delete user
-    Users.delete_user_by_id(user_id)
-    Auths.delete_auth_by_id(user_id)
+    # Delete user; delete_auth_by_id removes the user row (with their chats
+    # and group memberships) before the auth row
+    if not Auths.delete_auth_by_id(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ERROR_MESSAGES.DELETE_USER_ERROR
+        )
 
-    logger.info(f"User {user_id} deleted by manager {manager.id}")
+    logger.info("User %s deleted by manager %s", user_id, manager.id)
 
     return {
         "success": True,
@@ -481,19 +537,29 @@ async def get_my_managed_groups(
 
     Admins get all groups, managers get their assigned groups.
     """
-    logger.info(f"get_my_managed_groups called by user {manager.id}, role: {manager.role}")
-    logger.info(f"Manager managed_groups field: {manager.managed_groups}, type: {type(manager.managed_groups)}")
-
-    managed_group_ids = get_managed_groups(manager)
-    logger.info(f"Managed group IDs: {managed_group_ids}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "get_my_managed_groups called by user %s, role: %s", manager.id, manager.role
+        )
+        logger.debug(
+            "Manager managed_groups field: %s, type: %s",
+            manager.managed_groups,
+            type(manager.managed_groups),
+        )
 
     if is_admin(manager):
-        # Admin gets all groups
-        groups = Groups.get_groups({})
+        # Admin gets all groups; member counts are added below
+        groups = Groups.get_all_groups()
     else:
         # Manager gets only their assigned groups
-        groups = [Groups.get_group_by_id(gid) for gid in managed_group_ids]
-        groups = [g for g in groups if g]  # Filter out None
+        managed_group_ids = get_managed_groups(manager)
+        logger.debug("Managed group IDs: %s", managed_group_ids)
+
+        groups_by_id = Groups.get_groups_by_ids(managed_group_ids)
+        groups = [groups_by_id[gid] for gid in managed_group_ids if gid in groups_by_id]
+
+    # One grouped COUNT for all groups instead of a query per group
+    member_counts = Groups.get_member_counts([g.id for g in groups])
 
     return {
         "groups": [
@@ -501,7 +567,7 @@ async def get_my_managed_groups(
                 "id": g.id,
                 "name": g.name,
                 "description": g.description,
-                "member_count": Groups.get_group_member_count_by_id(g.id)
+                "member_count": member_counts.get(g.id, 0)
             }
             for g in groups
         ]
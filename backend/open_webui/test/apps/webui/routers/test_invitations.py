@@ -0,0 +1,213 @@
+import time
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+from test.util.mock_user import mock_user
+
+
+def mock_admin_user(**kwargs):
+    from main import app
+
+    return mock_user(app, role="admin", **kwargs)
+
+
+class TestInvitations(AbstractPostgresTest):
+    BASE_PATH = "/api/v1/invitations"
+
+    def setup_class(cls):
+        super().setup_class()
+        from open_webui.models.groups import Groups, GroupForm
+        from open_webui.models.invitations import Invitations
+
+        cls.groups = Groups
+        cls.group_form = GroupForm
+        cls.invitations = Invitations
+
+    def setup_method(self):
+        super().setup_method()
+        self.group = self.groups.insert_new_group(
+            "1", self.group_form(name="group 1", description="test group")
+        )
+
+    def _create_bulk(self, count, **kwargs):
+        with mock_admin_user(id="1"):
+            response = self.fast_api_client.post(
+                self.create_url("/create/bulk"),
+                json={"group_id": self.group.id, "count": count, **kwargs},
+            )
+        assert response.status_code == 200
+        return response.json()
+
+    def _validate(self, token):
+        response = self.fast_api_client.get(self.create_url(f"/validate/{token}"))
+        assert response.status_code == 200
+        return response.json()
+
+    def test_create_bulk(self):
+        invitations = self._create_bulk(5, max_uses=3, note="batch")
+        assert len(invitations) == 5
+        assert len({invitation["token"] for invitation in invitations}) == 5
+        for invitation in invitations:
+            assert invitation["group_id"] == self.group.id
+            assert invitation["group_name"] == "group 1"
+            assert invitation["max_uses"] == 3
+            assert invitation["note"] == "batch"
+            assert invitation["invitation_url"].endswith(invitation["token"])
+
+        # Unknown groups are rejected
+        with mock_admin_user(id="1"):
+            response = self.fast_api_client.post(
+                self.create_url("/create/bulk"),
+                json={"group_id": "unknown", "count": 2},
+            )
+        assert response.status_code == 404
+
+    def test_list_keyset_pagination(self):
+        created = self._create_bulk(5)
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            query_params = {"limit": 2}
+            if cursor:
+                query_params["cursor"] = cursor
+            with mock_admin_user(id="1"):
+                response = self.fast_api_client.get(
+                    self.create_url("/list", query_params)
+                )
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            seen.extend(invitation["id"] for invitation in page)
+            pages += 1
+
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert pages == 3
+        assert sorted(seen) == sorted(invitation["id"] for invitation in created)
+        assert len(set(seen)) == len(seen)
+
+        # The group listing pages the same way, and has a default page size
+        with mock_admin_user(id="1"):
+            response = self.fast_api_client.get(
+                self.create_url(f"/group/{self.group.id}")
+            )
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+        assert "X-Next-Cursor" not in response.headers
+
+        with mock_admin_user(id="1"):
+            response = self.fast_api_client.get(
+                self.create_url("/list", {"cursor": "not-a-cursor"})
+            )
+        assert response.status_code == 400
+
+    def test_list_all_for_admin(self):
+        other_group = self.groups.insert_new_group(
+            "1", self.group_form(name="group 2", description="test group")
+        )
+        self._create_bulk(2)
+        orphan = self.invitations.insert_new_invitation(
+            group_id=other_group.id, created_by="1", token="orphan-token"
+        )
+        self.groups.delete_group_by_id(other_group.id)
+
+        with mock_admin_user(id="1"):
+            response = self.fast_api_client.get(self.create_url("/list"))
+        assert response.status_code == 200
+        invitations = {invitation["id"]: invitation for invitation in response.json()}
+        assert len(invitations) == 3
+        assert invitations[orphan.id]["group_name"] == "Unknown Group"
+
+        # Managers only see the groups they manage
+        with mock_user(
+            self.fast_api_client.app,
+            id="2",
+            role="manager",
+            managed_groups=[self.group.id],
+        ):
+            response = self.fast_api_client.get(self.create_url("/list"))
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        assert orphan.id not in {invitation["id"] for invitation in response.json()}
+
+    def test_bulk_revoke(self):
+        invitations = self._create_bulk(3)
+        revoked = [invitations[0]["id"], invitations[1]["id"]]
+
+        with mock_admin_user(id="1"):
+            response = self.fast_api_client.post(
+                self.create_url("/bulk-revoke"),
+                json={"ids": revoked + ["unknown"]},
+            )
+        assert response.status_code == 200
+        assert response.json() == {"updated": 2, "skipped": ["unknown"]}
+
+        assert self._validate(invitations[0]["token"])["valid"] is False
+        assert self._validate(invitations[1]["token"])["valid"] is False
+        assert self._validate(invitations[2]["token"])["valid"] is True
+
+        for invitation_id in revoked:
+            invitation = self.invitations.get_invitation_by_id(invitation_id)
+            assert invitation.status == "disabled"
+
+    def test_bulk_delete(self):
+        invitations = self._create_bulk(3)
+        deleted = [invitations[0]["id"], invitations[1]["id"]]
+
+        with mock_admin_user(id="1"):
+            response = self.fast_api_client.request(
+                "DELETE",
+                self.create_url("/bulk"),
+                json={"ids": deleted + ["unknown"]},
+            )
+        assert response.status_code == 200
+        assert response.json() == {"updated": 2, "skipped": ["unknown"]}
+
+        for invitation_id in deleted:
+            assert self.invitations.get_invitation_by_id(invitation_id) is None
+        assert self.invitations.get_invitation_by_id(invitations[2]["id"]) is not None
+
+        assert self._validate(invitations[0]["token"])["valid"] is False
+
+    def test_invitation_validity(self):
+        now = int(time.time())
+
+        def insert(token, **kwargs):
+            return self.invitations.insert_new_invitation(
+                group_id=self.group.id, created_by="1", token=token, **kwargs
+            )
+
+        # 0 means unlimited uses / never expires, like NULL
+        insert("unlimited-zero", max_uses=0, expires_at=0)
+        insert("unlimited-null")
+        insert("future", expires_at=now + 3600)
+        insert("past", expires_at=now - 3600)
+        limited = insert("limited", max_uses=2)
+
+        assert self._validate("unlimited-zero")["valid"] is True
+        assert self._validate("unlimited-null")["valid"] is True
+        assert self._validate("future")["valid"] is True
+        assert self._validate("past")["valid"] is False
+        assert self._validate("missing")["valid"] is False
+
+        assert self.invitations.is_invitation_valid("unlimited-zero")
+        assert not self.invitations.is_invitation_valid("past")
+
+        # max_uses=0 never runs out
+        zero = self.invitations.get_invitation_by_token("unlimited-zero")
+        for _ in range(3):
+            zero = self.invitations.increment_invitation_uses(zero.id)
+        assert zero.current_uses == 3
+        assert zero.status == "active"
+        assert self.invitations.is_invitation_valid("unlimited-zero")
+
+        # A limited invitation expires on its last use and cannot go past it
+        self.invitations.increment_invitation_uses(limited.id)
+        last = self.invitations.increment_invitation_uses(limited.id)
+        assert last.current_uses == 2
+        assert last.status == "expired"
+        assert self.invitations.increment_invitation_uses(limited.id) is None
+        assert not self.invitations.is_invitation_valid("limited")
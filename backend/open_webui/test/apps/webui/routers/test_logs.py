@@ -0,0 +1,147 @@
+from fastapi.testclient import TestClient
+from pytest_docker.plugin import get_docker_ip
+from sqlalchemy import text
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+from test.util.mock_user import mock_user
+
+# Minimal logs table, as created in a group's own database
+LOGS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS logs (
+    id SERIAL PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    user_name TEXT NOT NULL,
+    insight_title TEXT NOT NULL,
+    insight_content TEXT NOT NULL,
+    source TEXT,
+    log_type TEXT,
+    activation_status TEXT,
+    verified BOOLEAN,
+    verification_method TEXT,
+    ai_generated_at TIMESTAMPTZ,
+    verified_at TIMESTAMPTZ,
+    verified_by TEXT,
+    ai_model TEXT,
+    ai_confidence_score DOUBLE PRECISION,
+    problem_category TEXT,
+    root_cause TEXT,
+    solution_steps JSONB,
+    tools_required JSONB,
+    tags JSONB,
+    equipment_group JSONB,
+    notes TEXT,
+    business_impact TEXT,
+    created_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL
+)
+"""
+
+
+def _log(i):
+    return {
+        "insight_title": f"log {i}",
+        "insight_content": f"content {i}",
+        "problem_category": "pumps" if i % 2 else "valves",
+        "solution_steps": ["step 1", "step 2"],
+        "tags": ["tag"],
+    }
+
+
+class TestLogs(AbstractPostgresTest):
+    BASE_PATH = "/api/v1/logs"
+
+    def setup_class(cls):
+        super().setup_class()
+        from open_webui.internal.db import Session
+        from open_webui.models.groups import Groups, GroupForm
+        from open_webui.utils.postgres_connection import postgres_manager
+
+        cls.groups = Groups
+        cls.group_form = GroupForm
+        cls.postgres_manager = postgres_manager
+
+        # The test database doubles as the group's log database
+        Session.execute(text(LOGS_TABLE_SQL))
+        Session.commit()
+
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.internal.db import Session
+        from open_webui.routers.logs import invalidate_group_database_cache
+
+        Session.execute(text("TRUNCATE TABLE logs"))
+        Session.commit()
+
+        self.group = self.groups.insert_new_group(
+            "1", self.group_form(name="group 1", description="test group")
+        )
+        connection = self.postgres_manager.create_connection_config(
+            f"psql -h {get_docker_ip()} -p 8081 -d openwebui -U user", "example"
+        )
+        # The test container does not serve TLS
+        connection["ssl"] = False
+        self.groups.patch_group_data(
+            self.group.id, "database", {"enabled": True, "connection": connection}
+        )
+        invalidate_group_database_cache()
+
+    def test_create_logs_bulk(self):
+        from main import app
+
+        # One client for every request, so the group pool stays on one event loop
+        with TestClient(app) as client:
+            with mock_user(app, id="1", role="admin", name="user 1"):
+                # Enough logs for the COPY path
+                response = client.post(
+                    self.create_url("/bulk", {"group_id": self.group.id}),
+                    json={"logs": [_log(i) for i in range(12)]},
+                )
+                assert response.status_code == 200
+                data = response.json()
+                assert data["success"] is True
+                assert len(data["log_ids"]) == 12
+                assert len(set(data["log_ids"])) == 12
+
+                # Below the threshold rows are inserted one by one
+                response = client.post(
+                    self.create_url("/bulk", {"group_id": self.group.id}),
+                    json={"logs": [_log(i) for i in range(12, 14)]},
+                )
+                assert response.status_code == 200
+                assert len(response.json()["log_ids"]) == 2
+
+                response = client.get(self.create_url("/", {"limit": 5}))
+                assert response.status_code == 200
+                data = response.json()
+                assert data["total"] == 14
+                assert len(data["logs"]) == 5
+                assert data["has_more"] is True
+                assert data["categories"] == ["pumps", "valves"]
+                log = data["logs"][0]
+                assert log["user_name"] == "user 1"
+                assert log["solution_steps"] == ["step 1", "step 2"]
+                assert log["created_at"]
+                assert log["verified_at"] == ""
+
+                # Totals and categories do not depend on the page being read
+                response = client.get(self.create_url("/", {"offset": 100}))
+                assert response.status_code == 200
+                data = response.json()
+                assert data["total"] == 14
+                assert data["logs"] == []
+                assert data["categories"] == ["pumps", "valves"]
+
+            client.portal.call(self.postgres_manager.close_all_pools)
+
+    def test_create_logs_bulk_without_database(self):
+        from open_webui.routers.logs import invalidate_group_database_cache
+
+        self.groups.patch_group_data(self.group.id, "database", {"enabled": False})
+        invalidate_group_database_cache()
+
+        with mock_user(self.fast_api_client.app, id="1", role="admin"):
+            response = self.fast_api_client.post(
+                self.create_url("/bulk", {"group_id": self.group.id}),
+                json={"logs": [_log(0)]},
+            )
+        assert response.status_code == 404
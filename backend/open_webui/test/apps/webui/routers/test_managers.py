@@ -0,0 +1,91 @@
+from test.util.abstract_integration_test import AbstractPostgresTest
+from test.util.mock_user import mock_user
+
+
+def mock_app_user(**kwargs):
+    from main import app
+
+    return mock_user(app, **kwargs)
+
+
+class TestManagers(AbstractPostgresTest):
+    BASE_PATH = "/api/v1/managers"
+
+    def setup_class(cls):
+        super().setup_class()
+        from open_webui.models.users import Users
+
+        cls.users = Users
+
+    def setup_method(self):
+        super().setup_method()
+        self.users.insert_new_user(
+            id="1",
+            name="user 1",
+            email="user1@openwebui.com",
+            profile_image_url="/user1.png",
+            role="admin",
+        )
+
+    def _has_pending_users(self, **kwargs):
+        with mock_app_user(**kwargs):
+            response = self.fast_api_client.get(
+                self.create_url("/pending-users/exists")
+            )
+        assert response.status_code == 200
+        return response.json()["has_pending_users"]
+
+    def test_pending_users_exists(self):
+        assert self._has_pending_users(id="1", role="admin") is False
+
+        self.users.insert_new_user(
+            id="2",
+            name="user 2",
+            email="user2@openwebui.com",
+            profile_image_url="/user2.png",
+            role="pending",
+        )
+        self.users.update_user_by_id("2", {"pending_group_id": "group-1"})
+
+        assert self._has_pending_users(id="1", role="admin") is True
+        assert (
+            self._has_pending_users(
+                id="3", role="manager", managed_groups=["group-1"]
+            )
+            is True
+        )
+        assert (
+            self._has_pending_users(
+                id="3", role="manager", managed_groups=["group-2"]
+            )
+            is False
+        )
+        assert self._has_pending_users(id="3", role="manager") is False
+
+    def test_get_pending_users(self):
+        self.users.insert_new_user(
+            id="2",
+            name="user 2",
+            email="user2@openwebui.com",
+            profile_image_url="/user2.png",
+            role="pending",
+        )
+        self.users.update_user_by_id("2", {"pending_group_id": "group-1"})
+
+        with mock_app_user(id="1", role="admin"):
+            response = self.fast_api_client.get(self.create_url("/pending-users"))
+        assert response.status_code == 200
+        pending_users = response.json()
+        assert len(pending_users) == 1
+        assert pending_users[0]["id"] == "2"
+        assert pending_users[0]["email"] == "user2@openwebui.com"
+        assert pending_users[0]["pending_group_id"] == "group-1"
+        # The group does not exist, so there is no name to show
+        assert pending_users[0]["pending_group_name"] is None
+
+    def test_pending_users_exists_forbidden(self):
+        with mock_app_user(id="2", role="user"):
+            response = self.fast_api_client.get(
+                self.create_url("/pending-users/exists")
+            )
+        assert response.status_code == 401
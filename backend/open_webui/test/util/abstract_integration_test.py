@@ -155,6 +155,9 @@ class AbstractPostgresTest(AbstractIntegrationTest):
             "prompt",
             "tag",
             '"user"',
+            "invitation",
+            '"group"',
+            "group_member",
         ]
         for table in tables:
             Session.execute(text(f"TRUNCATE TABLE {table}"))
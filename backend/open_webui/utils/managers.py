@@ -9,6 +9,7 @@ The manager role allows users to:
 """
 
 from typing import Optional
+from fastapi import Request
 from open_webui.models.users import UserModel
 from open_webui.models.groups import Groups, GroupMembers
 
@@ -28,18 +29,24 @@ def is_admin_or_manager(user: UserModel) -> bool:
     return user.role in ["admin", "manager"]
 
 
-def can_manage_group(user: UserModel, group_id: str) -> bool:
+def can_manage_group(
+    user: UserModel, group_id: str, request: Optional[Request] = None
+) -> bool:
     """
     Check if user can manage the specified group.
 
     Admins can manage all groups.
     Managers can only manage groups in their managed_groups list.
+    When the request is passed, the managed group set is reused across
+    checks made during the same request.
     """
     if is_admin(user):
         return True
 
     if is_manager(user):
-        if user.managed_groups and group_id in user.managed_groups:
+        if request is not None:
+            return group_id in get_managed_group_ids(request, user)
+        if group_id in user.managed_groups_set:
             return True
 
     return False
@@ -53,9 +60,8 @@ def get_managed_groups(user: UserModel) -> list[str]:
     Managers get their managed_groups list.
     """
     if is_admin(user):
-        # Return all group IDs
-        all_groups = Groups.get_groups({})
-        return [group.id for group in all_groups]
+        # Return all group IDs, without loading the groups themselves
+        return Groups.get_group_ids()
 
     if is_manager(user) and user.managed_groups:
         return user.managed_groups
@@ -63,22 +69,64 @@ def get_managed_groups(user: UserModel) -> list[str]:
     return []
 
 
-def can_manage_user(manager: UserModel, target_user_id: str) -> bool:
+def get_managed_group_ids(request: Request, user: UserModel) -> frozenset[str]:
+    """
+    Group IDs the user can manage, computed once per request.
+
+    The result is stored on request.state so later permission checks in the
+    same request are set lookups instead of recomputing get_managed_groups.
+    """
+    managed_group_ids = getattr(request.state, "managed_group_ids", None)
+    if managed_group_ids is None:
+        managed_group_ids = frozenset(get_managed_groups(user))
+        request.state.managed_group_ids = managed_group_ids
+    return managed_group_ids
+
+
+def get_member_group_ids(request: Request, user_id: str) -> frozenset[str]:
+    """
+    Group IDs a user is a member of, computed once per request and user.
+
+    Memoized on request.state like get_managed_group_ids, so repeated
+    permission checks on the same user reuse one membership query.
+    """
+    member_group_ids = getattr(request.state, "member_group_ids", None)
+    if member_group_ids is None:
+        member_group_ids = {}
+        request.state.member_group_ids = member_group_ids
+
+    group_ids = member_group_ids.get(user_id)
+    if group_ids is None:
+        group_ids = frozenset(GroupMembers.get_groups_by_member_id(user_id))
+        member_group_ids[user_id] = group_ids
+    return group_ids
+
+
+def can_manage_user(
+    manager: UserModel, target_user_id: str, request: Optional[Request] = None
+) -> bool:
     """
     Check if manager can manage a specific user.
 
     Manager can manage user if:
     - They are an admin (can manage all users)
     - They are a manager and user belongs to one of their managed groups
+
+    When the request is passed, both group sets are reused across checks
+    made during the same request.
     """
     if is_admin(manager):
         return True
 
     if is_manager(manager) and manager.managed_groups:
-        # Check if target user is in any of manager's groups
-        for group_id in manager.managed_groups:
-            if GroupMembers.is_user_in_group(target_user_id, group_id):
-                return True
+        if request is not None:
+            managed_group_ids = get_managed_group_ids(request, manager)
+            target_group_ids = get_member_group_ids(request, target_user_id)
+        else:
+            # One membership query, then a set check against the managed groups
+            managed_group_ids = manager.managed_groups_set
+            target_group_ids = GroupMembers.get_groups_by_member_id(target_user_id)
+        return not managed_group_ids.isdisjoint(target_group_ids)
 
     return False
 
@@ -107,15 +155,10 @@ def add_managed_group(user: UserModel, group_id: str) -> UserModel:
     """Add a group to user's managed_groups list"""
     from open_webui.models.users import Users
 
-    if not user.managed_groups:
-        user.managed_groups = []
-
-    if group_id not in user.managed_groups:
-        user.managed_groups.append(group_id)
-        Users.update_user_by_id(
-            user.id,
-            {"managed_groups": user.managed_groups}
-        )
+    updated = Users.update_managed_groups_by_id(user.id, add=group_id)
+    if updated:
+        # Sync with the stored list, which may include concurrent changes
+        user.managed_groups = updated.managed_groups
 
     return user
 
@@ -124,12 +167,9 @@ def remove_managed_group(user: UserModel, group_id: str) -> UserModel:
     """Remove a group from user's managed_groups list"""
     from open_webui.models.users import Users
 
-    if user.managed_groups and group_id in user.managed_groups:
-        user.managed_groups.remove(group_id)
-        Users.update_user_by_id(
-            user.id,
-            {"managed_groups": user.managed_groups}
-        )
+    updated = Users.update_managed_groups_by_id(user.id, remove=group_id)
+    if updated:
+        user.managed_groups = updated.managed_groups
 
     return user
 
@@ -146,16 +186,10 @@ def get_pending_users_for_manager(manager: UserModel) -> list:
 
     if is_admin(manager):
         # Admins see all pending users
-        return Users.get_users(skip=0, limit=1000)  # TODO: Add filtering by role
+        return Users.get_pending_users()
 
     if is_manager(manager) and manager.managed_groups:
         # Get pending users for manager's groups
-        all_users = Users.get_users(skip=0, limit=1000)
-        pending_users = [
-            user for user in all_users
-            if user.role == "pending"
-            and user.pending_group_id in manager.managed_groups
-        ]
-        return pending_users
+        return Users.get_pending_users(manager.managed_groups)
 
     return []
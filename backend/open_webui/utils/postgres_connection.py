@@ -3,41 +3,177 @@ PostgreSQL connection utilities for Supabase integration
 Handles parsing of psql connection strings and secure connection management
 """
 
-import re
 import asyncio
 import asyncpg
-from typing import Dict, Optional, Any
-from cryptography.fernet import Fernet
+import orjson
+from typing import TYPE_CHECKING, Dict, Optional, Any, Tuple
 import os
+import time
 import base64
+import hashlib
 import logging
+import shlex
 from contextlib import asynccontextmanager
+from functools import cached_property, lru_cache
+
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
 
 logger = logging.getLogger(__name__)
 
+# Connection-test pools unused for this many seconds are closed
+TEST_POOL_IDLE_TIMEOUT = 300
+
+# Group database pools. The logs endpoints query every group database at once,
+# so allow some concurrency per pool, but keep min_size low: there is one pool
+# per group and each idle connection counts against the database's limit.
+# Set GROUP_DB_STATEMENT_CACHE_SIZE=0 when connecting through PgBouncer in
+# transaction pooling mode, which does not support prepared statements.
+GROUP_DB_POOL_MIN_SIZE = int(os.getenv("GROUP_DB_POOL_MIN_SIZE", "1"))
+GROUP_DB_POOL_MAX_SIZE = int(os.getenv("GROUP_DB_POOL_MAX_SIZE", "10"))
+GROUP_DB_STATEMENT_CACHE_SIZE = int(os.getenv("GROUP_DB_STATEMENT_CACHE_SIZE", "1024"))
+GROUP_DB_MAX_INACTIVE_CONNECTION_LIFETIME = float(
+    os.getenv("GROUP_DB_MAX_INACTIVE_CONNECTION_LIFETIME", "300")
+)
+GROUP_DB_COMMAND_TIMEOUT = 30
+GROUP_DB_APPLICATION_NAME = os.getenv("GROUP_DB_APPLICATION_NAME", "open-webui-logs")
+
+# Per-session settings for group connections, sent in the startup packet so
+# they cost no extra round trip. The logs queries are short, so JIT
+# compilation costs more than it saves; the server-side timeout matches
+# command_timeout so abandoned queries stop running too.
+GROUP_DB_SERVER_SETTINGS = {
+    "application_name": GROUP_DB_APPLICATION_NAME,
+    "jit": "off",
+    "statement_timeout": f"{GROUP_DB_COMMAND_TIMEOUT}s",
+}
+
+# Connection configs remembered by create_connection_config
+CONNECTION_CONFIG_CACHE_SIZE = 256
+
+# psql flags we read, mapped to connection parameter names
+PSQL_CONNECTION_FLAGS = {"-h": "host", "-p": "port", "-d": "database", "-U": "user"}
+
+PSQL_CONNECTION_FORMAT_ERROR = (
+    "Invalid psql connection string format. "
+    "Expected: psql -h hostname -p port -d database -U username"
+)
+
+
+@lru_cache(maxsize=256)
+def _parse_psql_connection_string(connection_string: str) -> Tuple[str, int, str, str]:
+    """
+    Parse a psql command into (host, port, database, user), memoised per string
+
+    The flags may appear in any order; other psql arguments are ignored.
+    """
+    tokens = shlex.split(connection_string)
+
+    # Anything before the psql command itself (e.g. env assignments) is skipped
+    try:
+        start = tokens.index("psql") + 1
+    except ValueError:
+        raise ValueError(PSQL_CONNECTION_FORMAT_ERROR)
+
+    params = {}
+    for flag, value in zip(tokens[start:], tokens[start + 1:]):
+        name = PSQL_CONNECTION_FLAGS.get(flag)
+        if name and name not in params and not value.startswith("-"):
+            params[name] = value
+
+    if len(params) != len(PSQL_CONNECTION_FLAGS) or not params["port"].isdigit():
+        raise ValueError(PSQL_CONNECTION_FORMAT_ERROR)
+
+    return params["host"], int(params["port"]), params["database"], params["user"]
+
+
+# jsonb binary wire format: a version byte followed by the JSON text
+JSONB_BINARY_VERSION = b"\x01"
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    return JSONB_BINARY_VERSION + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return orjson.loads(memoryview(data)[1:])
+
+
+async def _init_group_connection(conn: asyncpg.Connection):
+    """Decode jsonb columns to Python objects (and encode them back) with orjson"""
+    # Binary format hands orjson the raw bytes, skipping asyncpg's text decode
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema="pg_catalog",
+        format="binary",
+    )
+
+
+@lru_cache(maxsize=4)
+def _fernet_for(key_env: Optional[str]) -> "Fernet":
+    """
+    Build the Fernet for an encryption key setting, once per process
+
+    A generated key is cached too, so every manager in the process can read
+    passwords encrypted by the others.
+    """
+    # Imported here so parsing-only users of this module skip the OpenSSL load
+    from cryptography.fernet import Fernet
+
+    if key_env:
+        try:
+            key = base64.urlsafe_b64decode(key_env.encode())
+            return Fernet(key)
+        except Exception as e:
+            logger.warning(f"Invalid encryption key in environment: {e}")
+    
+    # Generate new key if none exists
+    key = Fernet.generate_key()
+    key_b64 = base64.urlsafe_b64encode(key).decode()
+    logger.warning(f"Generated new encryption key. Set DATABASE_PASSWORD_ENCRYPTION_KEY={key_b64}")
+    return Fernet(key)
+
+
+def _ssl_mode(config: Dict[str, Any]):
+    """asyncpg ssl argument for a connection config"""
+    # Use "require" for Supabase SSL; configs default to SSL on
+    return "require" if config.get("ssl", True) else False
+
+
 class PostgreSQLConnectionManager:
     """Manages PostgreSQL connections for group-based database access"""
     
     def __init__(self):
-        self._connection_pools: Dict[str, asyncpg.Pool] = {}
-        self._encryption_key = self._get_or_create_encryption_key()
+        # Groups using the same database and credentials share one pool, so the
+        # number of open connections scales with databases rather than groups
+        self._pools_by_dsn: Dict[Tuple, asyncpg.Pool] = {}
+        # group_id -> key of the pool it uses; a pool is closed once no
+        # group maps to it
+        self._group_dsns: Dict[str, Tuple] = {}
+        # Serialises pool creation per pool key; lookups of existing pools skip it
+        self._create_locks: Dict[Tuple, asyncio.Lock] = {}
+        # Pools used by test_connection, keyed by DSN rather than group
+        self._test_pools: Dict[str, asyncpg.Pool] = {}
+        self._test_pools_last_used: Dict[str, float] = {}
+        # Serialises test pool creation per DSN, like _create_locks
+        self._test_create_locks: Dict[str, asyncio.Lock] = {}
+        # group_id -> (encrypted, decrypted) password, so recreating a group's
+        # pool with an unchanged config skips the Fernet decryption
+        self._decrypted_passwords: Dict[str, Tuple[str, str]] = {}
+        # Fingerprint of (connection string, password) -> built config, so the
+        # same inputs skip Fernet and reuse one ciphertext
+        self._config_cache: Dict[str, Dict[str, Any]] = {}
     
-    def _get_or_create_encryption_key(self) -> Fernet:
+    @cached_property
+    def _encryption_key(self) -> "Fernet":
+        """Built on first use, so managers that never touch passwords skip it"""
+        return self._get_or_create_encryption_key()
+
+    def _get_or_create_encryption_key(self) -> "Fernet":
         """Get or create encryption key for storing database passwords"""
-        key_env = os.getenv("DATABASE_PASSWORD_ENCRYPTION_KEY")
-        
-        if key_env:
-            try:
-                key = base64.urlsafe_b64decode(key_env.encode())
-                return Fernet(key)
-            except Exception as e:
-                logger.warning(f"Invalid encryption key in environment: {e}")
-        
-        # Generate new key if none exists
-        key = Fernet.generate_key()
-        key_b64 = base64.urlsafe_b64encode(key).decode()
-        logger.warning(f"Generated new encryption key. Set DATABASE_PASSWORD_ENCRYPTION_KEY={key_b64}")
-        return Fernet(key)
+        return _fernet_for(os.getenv("DATABASE_PASSWORD_ENCRYPTION_KEY"))
     
     def parse_psql_connection_string(self, connection_string: str) -> Dict[str, Any]:
         """
@@ -52,24 +188,13 @@ class PostgreSQLConnectionManager:
         Raises:
             ValueError: If connection string format is invalid
         """
-        # Clean up the connection string
-        connection_string = connection_string.strip()
-        
-        # Pattern to match psql command with parameters
-        pattern = r'psql\s+-h\s+(\S+)\s+-p\s+(\d+)\s+-d\s+(\S+)\s+-U\s+(\S+)'
-        match = re.search(pattern, connection_string)
-        
-        if not match:
-            raise ValueError(
-                "Invalid psql connection string format. "
-                "Expected: psql -h hostname -p port -d database -U username"
-            )
+        host, port, database, user = _parse_psql_connection_string(connection_string)
         
         return {
-            "host": match.group(1),
-            "port": int(match.group(2)),
-            "database": match.group(3),
-            "user": match.group(4)
+            "host": host,
+            "port": port,
+            "database": database,
+            "user": user
         }
     
     def encrypt_password(self, password: str) -> str:
@@ -88,6 +213,16 @@ class PostgreSQLConnectionManager:
             logger.error(f"Failed to decrypt password: {e}")
             raise ValueError("Failed to decrypt database password")
     
+    def _get_group_password(self, group_id: str, encrypted_password: str) -> str:
+        """Decrypt a group's stored password, reusing the last result if unchanged"""
+        cached = self._decrypted_passwords.get(group_id)
+        if cached and cached[0] == encrypted_password:
+            return cached[1]
+
+        password = self.decrypt_password(encrypted_password)
+        self._decrypted_passwords[group_id] = (encrypted_password, password)
+        return password
+
     def create_connection_config(
         self, 
         connection_string: str, 
@@ -103,42 +238,137 @@ class PostgreSQLConnectionManager:
         Returns:
             Dict with connection config including encrypted password
         """
-        config = self.parse_psql_connection_string(connection_string)
-        config["password"] = self.encrypt_password(password)
-        config["ssl"] = True  # Default to SSL for Supabase
-        return config
+        fingerprint = hashlib.blake2b(
+            f"{connection_string}\0{password}".encode(), digest_size=16
+        ).hexdigest()
+        cached = self._config_cache.get(fingerprint)
+        if cached:
+            return dict(cached)  # Copy so callers cannot change the cached config
+
+        host, port, database, user = _parse_psql_connection_string(connection_string)
+        config = {
+            "host": host,
+            "port": port,
+            "database": database,
+            "user": user,
+            "password": self.encrypt_password(password),
+            "ssl": True,  # Default to SSL for Supabase
+        }
+
+        if len(self._config_cache) >= CONNECTION_CONFIG_CACHE_SIZE:
+            # Evict the oldest entry
+            self._config_cache.pop(next(iter(self._config_cache)))
+        self._config_cache[fingerprint] = config
+        return dict(config)
     
+    def _dsn_key(self, config: Dict[str, Any]) -> str:
+        """Normalized pool key for a connection config (includes the stored password)"""
+        return (
+            f"{config['user']}@{config['host'].lower()}:{config['port']}"
+            f"/{config['database']}#{config.get('password', '')}"
+        )
+
+    def _pool_key(self, config: Dict[str, Any]) -> Tuple:
+        """
+        Key identifying the pool a group connection config can use
+
+        Besides the database it includes a fingerprint of the stored password,
+        so a rotated password gets a fresh pool and groups holding different
+        credentials never borrow each other's, and the pool sizing, so each
+        group gets the limits its config asks for.
+        """
+        credential = hashlib.blake2b(
+            config.get("password", "").encode(), digest_size=8
+        ).hexdigest()
+        return (
+            config["host"].lower(),
+            config["port"],
+            config["database"],
+            config["user"],
+            credential,
+            config.get("min_size", GROUP_DB_POOL_MIN_SIZE),
+            config.get("max_size", GROUP_DB_POOL_MAX_SIZE),
+        )
+
+    async def _evict_idle_test_pools(self):
+        """Close connection-test pools that have not been used recently"""
+        now = time.monotonic()
+        idle_keys = [
+            key
+            for key, last_used in self._test_pools_last_used.items()
+            if now - last_used > TEST_POOL_IDLE_TIMEOUT
+        ]
+        for key in idle_keys:
+            await self._close_test_pool(key)
+
+    async def _close_test_pool(self, key: str):
+        pool = self._test_pools.pop(key, None)
+        self._test_pools_last_used.pop(key, None)
+        if pool:
+            try:
+                await pool.close()
+            except Exception as e:
+                logger.error(f"Error closing test pool: {e}")
+
+    async def _get_test_pool(self, key: str, config: Dict[str, Any]) -> asyncpg.Pool:
+        """Get or create the connection-test pool for a DSN"""
+        pool = self._test_pools.get(key)
+        if pool is not None:
+            return pool
+
+        lock = self._test_create_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another test of the same DSN may have created the pool while we waited
+            pool = self._test_pools.get(key)
+            if pool is not None:
+                return pool
+
+            pool = await asyncpg.create_pool(
+                host=config["host"],
+                port=config["port"],
+                database=config["database"],
+                user=config["user"],
+                password=self.decrypt_password(config["password"]),
+                ssl=_ssl_mode(config),
+                min_size=1,
+                max_size=5,
+                command_timeout=30,
+            )
+            self._test_pools[key] = pool
+            return pool
+
     async def test_connection(self, config: Dict[str, Any]) -> bool:
         """
         Test database connection with given configuration
-        
+
+        Connections come from a small pool per DSN so repeated checks of the
+        same database skip the TCP/TLS/auth handshake.
+
         Args:
             config: Connection configuration dict
         
         Returns:
             True if connection successful, False otherwise
         """
+        key = None
         try:
-            # Create connection parameters
-            conn_params = {
-                "host": config["host"],
-                "port": config["port"],
-                "database": config["database"],
-                "user": config["user"],
-                "password": self.decrypt_password(config["password"]),
-                "ssl": "require"  # Use "require" for Supabase SSL
-            }
-            
+            await self._evict_idle_test_pools()
+
+            key = self._dsn_key(config)
+            pool = await self._get_test_pool(key, config)
+            self._test_pools_last_used[key] = time.monotonic()
+
             # Test connection
-            conn = await asyncpg.connect(**conn_params)
-            await conn.execute("SELECT 1")
-            await conn.close()
+            async with pool.acquire() as conn:
+                await conn.fetchval("SELECT 1")
             
             logger.info(f"Database connection test successful for {config['host']}")
             return True
             
         except Exception as e:
-            logger.error(f"Database connection test failed for {config['host']}: {e}")
+            logger.error(f"Database connection test failed for {config.get('host')}: {e}")
+            if key:
+                await self._close_test_pool(key)
             return False
     
     async def get_connection_pool(self, group_id: str, config: Dict[str, Any]) -> Optional[asyncpg.Pool]:
@@ -152,9 +382,27 @@ class PostgreSQLConnectionManager:
         Returns:
             Connection pool or None if failed
         """
-        if group_id in self._connection_pools:
-            return self._connection_pools[group_id]
-        
+        key = self._pool_key(config)
+        if self._group_dsns.get(group_id) != key:
+            # First use, or the group's config now points at another database
+            await self.close_pool(group_id)
+            self._group_dsns[group_id] = key
+
+        pool = self._pools_by_dsn.get(key)
+        if pool is not None:
+            return pool
+
+        lock = self._create_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have created the pool while we waited
+            pool = self._pools_by_dsn.get(key)
+            if pool is not None:
+                return pool
+            return await self._create_connection_pool(group_id, key, config)
+
+    async def _create_connection_pool(
+        self, group_id: str, key: Tuple, config: Dict[str, Any]
+    ) -> Optional[asyncpg.Pool]:
         try:
             # Create connection parameters
             conn_params = {
@@ -162,16 +410,23 @@ class PostgreSQLConnectionManager:
                 "port": config["port"],
                 "database": config["database"],
                 "user": config["user"],
-                "password": self.decrypt_password(config["password"]),
-                "ssl": "require",  # Use "require" for Supabase SSL
-                "min_size": 1,
-                "max_size": 5,  # Limit concurrent connections
-                "command_timeout": 30
+                "password": self._get_group_password(group_id, config["password"]),
+                "ssl": _ssl_mode(config),
+                # A busy group can size its own pool in its connection config;
+                # create_pool opens min_size connections up front
+                "min_size": config.get("min_size", GROUP_DB_POOL_MIN_SIZE),
+                "max_size": config.get("max_size", GROUP_DB_POOL_MAX_SIZE),
+                "statement_cache_size": GROUP_DB_STATEMENT_CACHE_SIZE,
+                "max_inactive_connection_lifetime": GROUP_DB_MAX_INACTIVE_CONNECTION_LIFETIME,
+                "command_timeout": GROUP_DB_COMMAND_TIMEOUT,
+                "server_settings": GROUP_DB_SERVER_SETTINGS,
+                # Runs once per new connection, not per acquire
+                "init": _init_group_connection,
             }
             
             # Create connection pool
             pool = await asyncpg.create_pool(**conn_params)
-            self._connection_pools[group_id] = pool
+            self._pools_by_dsn[key] = pool
             
             logger.info(f"Created connection pool for group {group_id}")
             return pool
@@ -200,22 +455,41 @@ class PostgreSQLConnectionManager:
             await pool.release(conn)
     
     async def close_pool(self, group_id: str):
-        """Close connection pool for specific group"""
-        if group_id in self._connection_pools:
-            await self._connection_pools[group_id].close()
-            del self._connection_pools[group_id]
+        """
+        Release a group's connection pool
+
+        The pool itself is closed only when no other group shares it.
+        """
+        self._decrypted_passwords.pop(group_id, None)
+        key = self._group_dsns.pop(group_id, None)
+        if key is None or key in self._group_dsns.values():
+            return
+
+        pool = self._pools_by_dsn.pop(key, None)
+        if pool:
+            await pool.close()
             logger.info(f"Closed connection pool for group {group_id}")
     
     async def close_all_pools(self):
         """Close all connection pools"""
-        for group_id, pool in self._connection_pools.items():
-            try:
-                await pool.close()
-                logger.info(f"Closed connection pool for group {group_id}")
-            except Exception as e:
-                logger.error(f"Error closing pool for group {group_id}: {e}")
-        
-        self._connection_pools.clear()
+        # Detach everything first so callers arriving mid-shutdown create
+        # fresh pools instead of picking up ones being closed
+        pools = list(self._pools_by_dsn.items())
+        self._pools_by_dsn.clear()
+        self._group_dsns.clear()
+        self._decrypted_passwords.clear()
+
+        # Pools drain independently, so close them all at once
+        results = await asyncio.gather(
+            *(pool.close() for _, pool in pools), return_exceptions=True
+        )
+        for (key, _), result in zip(pools, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error closing pool for database {key[2]} on {key[0]}: {result}")
+            else:
+                logger.info(f"Closed connection pool for database {key[2]} on {key[0]}")
+
+        await asyncio.gather(*(self._close_test_pool(key) for key in list(self._test_pools)))
 
 # Global connection manager instance
 postgres_manager = PostgreSQLConnectionManager()
@@ -11,12 +11,21 @@ import json
 import sys
 from pathlib import Path
 
+# orjson is a backend dependency; fall back to the stdlib outside that env.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except works.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # Database path
 DB_PATH = Path(__file__).parent / "backend" / "data" / "webui.db"
 
-def check_managers():
+# Marks a group whose data column is not valid JSON
+INVALID_JSON = object()
+
+def check_managers(conn):
     """Check all users with manager role and their managed_groups"""
-    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
     print("=" * 80)
@@ -29,16 +38,12 @@ def check_managers():
         WHERE role = 'manager'
     """)
 
-    managers = cursor.fetchall()
-
-    if not managers:
-        print("\n⚠️  No users with role='manager' found!")
-        print("   Make sure you have created manager users.\n")
-        return []
-
     manager_group_map = {}
+    found_managers = False
 
-    for user_id, email, name, role, managed_groups_json in managers:
+    # Stream rows from the cursor rather than materialising them with fetchall
+    for user_id, email, name, role, managed_groups_json in cursor:
+        found_managers = True
         print(f"\n✓ Manager Found: {name} ({email})")
         print(f"  User ID: {user_id}")
         print(f"  Role: {role}")
@@ -49,7 +54,7 @@ def check_managers():
             continue
 
         try:
-            managed_groups = json.loads(managed_groups_json)
+            managed_groups = json_loads(managed_groups_json)
             if not managed_groups or len(managed_groups) == 0:
                 print(f"  ⚠️  managed_groups: [] (empty array)")
                 print("     → Button will NOT show (no groups assigned)")
@@ -64,18 +69,56 @@ def check_managers():
             print(f"  ⚠️  managed_groups: Invalid JSON: {managed_groups_json}")
             print("     → Button will NOT show (invalid data)")
 
-    conn.close()
+    if not found_managers:
+        print("\n⚠️  No users with role='manager' found!")
+        print("   Make sure you have created manager users.\n")
+        return []
+
     return manager_group_map
 
-def check_groups(manager_group_map):
+def load_groups(cursor, group_ids):
+    """
+    Fetch the given groups in one query and parse each data column once
+
+    Returns {id: (id, name, raw data, parsed data)}; missing groups are left
+    out. Parsed data is None when the column is NULL and INVALID_JSON when it
+    cannot be parsed.
+    """
+    placeholders = ", ".join("?" * len(group_ids))
+    cursor.execute(f"""
+        SELECT id, name, data
+        FROM "group"
+        WHERE id IN ({placeholders})
+    """, group_ids)
+
+    groups = {}
+    for db_id, name, data_json in cursor:
+        data = None
+        if data_json:
+            try:
+                data = json_loads(data_json)
+            except json.JSONDecodeError:
+                data = INVALID_JSON
+        groups[db_id] = (db_id, name, data_json, data)
+
+    return groups
+
+def check_groups(conn, manager_group_map):
     """Check if groups have management_dashboard_url configured"""
-    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
     print("\n" + "=" * 80)
     print("CHECKING GROUP CONFIGURATIONS")
     print("=" * 80)
 
+    # Managers often share groups; load every group they reference at once
+    group_ids = list({
+        group_id
+        for manager_info in manager_group_map.values()
+        for group_id in manager_info['groups']
+    })
+    groups = load_groups(cursor, group_ids)
+
     for manager_id, manager_info in manager_group_map.items():
         print(f"\n\nManager: {manager_info['name']} ({manager_info['email']})")
         print("-" * 80)
@@ -83,20 +126,14 @@ def check_groups(manager_group_map):
         has_dashboard_groups = False
 
         for group_id in manager_info['groups']:
-            cursor.execute("""
-                SELECT id, name, data
-                FROM "group"
-                WHERE id = ?
-            """, (group_id,))
-
-            result = cursor.fetchone()
+            result = groups.get(group_id)
 
             if not result:
                 print(f"\n  ⚠️  Group ID: {group_id}")
                 print("     ERROR: Group not found in database!")
                 continue
 
-            db_id, name, data_json = result
+            db_id, name, data_json, data = result
             print(f"\n  Group: {name}")
             print(f"  ID: {db_id}")
 
@@ -106,24 +143,24 @@ def check_groups(manager_group_map):
                 print("     → Button will NOT show for this group")
                 continue
 
-            try:
-                data = json.loads(data_json)
-                dashboard_url = data.get('management_dashboard_url')
-
-                if dashboard_url:
-                    print(f"  ✓ Dashboard URL: {dashboard_url}")
-                    print("     → Button WILL show for this group")
-                    has_dashboard_groups = True
-                else:
-                    print("  ⚠️  management_dashboard_url: Not set")
-                    print("     → Button will NOT show for this group")
-
-                    # Show what other data exists
-                    if data:
-                        print(f"     Other data fields: {list(data.keys())}")
-            except json.JSONDecodeError:
+            if data is INVALID_JSON:
                 print(f"  ⚠️  data: Invalid JSON: {data_json}")
                 print("     → Button will NOT show for this group")
+                continue
+
+            dashboard_url = data.get('management_dashboard_url')
+
+            if dashboard_url:
+                print(f"  ✓ Dashboard URL: {dashboard_url}")
+                print("     → Button WILL show for this group")
+                has_dashboard_groups = True
+            else:
+                print("  ⚠️  management_dashboard_url: Not set")
+                print("     → Button will NOT show for this group")
+
+                # Show what other data exists
+                if data:
+                    print(f"     Other data fields: {list(data.keys())}")
 
         print(f"\n  {'✓' if has_dashboard_groups else '⚠️'}  Overall: ", end='')
         if has_dashboard_groups:
@@ -132,8 +169,6 @@ def check_groups(manager_group_map):
             print(f"Button will NOT show for {manager_info['name']}")
             print("     → None of their managed groups have dashboard URL configured")
 
-    conn.close()
-
 def show_fix_instructions():
     """Show how to fix common issues"""
     print("\n" + "=" * 80)
@@ -175,16 +210,21 @@ def main():
         print("   Make sure you're running this from the project root directory.")
         sys.exit(1)
 
-    # Check managers
-    manager_group_map = check_managers()
-
-    if not manager_group_map:
-        print("\n⚠️  No managers with managed groups found.")
-        show_fix_instructions()
-        return
-
-    # Check groups
-    check_groups(manager_group_map)
+    # One connection serves both checks
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        # Check managers
+        manager_group_map = check_managers(conn)
+
+        if not manager_group_map:
+            print("\n⚠️  No managers with managed groups found.")
+            show_fix_instructions()
+            return
+
+        # Check groups
+        check_groups(conn, manager_group_map)
+    finally:
+        conn.close()
 
     # Show fix instructions
     show_fix_instructions()
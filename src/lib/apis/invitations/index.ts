@@ -57,11 +57,18 @@ export const createInvitation = async (token: string, data: CreateInvitationRequ
 	return res as InvitationResponse;
 };
 
-// Get invitations for a specific group
-export const getGroupInvitations = async (token: string, groupId: string) => {
+export interface InvitationPage {
+	invitations: InvitationResponse[];
+	// Pass back as `cursor` to fetch the next page; null on the last page
+	nextCursor: string | null;
+}
+
+// Fetch one page of a paged invitation listing
+const getInvitationPage = async (token: string, url: string, cursor: string | null = null) => {
 	let error = null;
 
-	const res = await fetch(`${WEBUI_API_BASE_URL}/invitations/group/${groupId}`, {
+	const pageUrl = cursor ? `${url}?cursor=${encodeURIComponent(cursor)}` : url;
+	const res = await fetch(pageUrl, {
 		method: 'GET',
 		headers: {
 			Accept: 'application/json',
@@ -71,7 +78,10 @@ export const getGroupInvitations = async (token: string, groupId: string) => {
 	})
 		.then(async (res) => {
 			if (!res.ok) throw await res.json();
-			return res.json();
+			return {
+				invitations: (await res.json()) as InvitationResponse[],
+				nextCursor: res.headers.get('X-Next-Cursor')
+			};
 		})
 		.catch((err) => {
 			error = err.detail;
@@ -79,40 +89,25 @@ export const getGroupInvitations = async (token: string, groupId: string) => {
 			return null;
 		});
 
-	if (error) {
+	if (error || !res) {
 		throw error;
 	}
 
-	return res as InvitationResponse[];
+	return res as InvitationPage;
 };
 
-// List all invitations accessible to current user
-export const listMyInvitations = async (token: string) => {
-	let error = null;
-
-	const res = await fetch(`${WEBUI_API_BASE_URL}/invitations/list`, {
-		method: 'GET',
-		headers: {
-			Accept: 'application/json',
-			'Content-Type': 'application/json',
-			authorization: `Bearer ${token}`
-		}
-	})
-		.then(async (res) => {
-			if (!res.ok) throw await res.json();
-			return res.json();
-		})
-		.catch((err) => {
-			error = err.detail;
-			console.error(err);
-			return null;
-		});
-
-	if (error) {
-		throw error;
-	}
+// Get a page of invitations for a specific group
+export const getGroupInvitations = async (
+	token: string,
+	groupId: string,
+	cursor: string | null = null
+) => {
+	return getInvitationPage(token, `${WEBUI_API_BASE_URL}/invitations/group/${groupId}`, cursor);
+};
 
-	return res as InvitationResponse[];
+// List a page of invitations accessible to current user
+export const listMyInvitations = async (token: string, cursor: string | null = null) => {
+	return getInvitationPage(token, `${WEBUI_API_BASE_URL}/invitations/list`, cursor);
 };
 
 // Revoke an invitation